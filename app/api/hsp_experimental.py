@@ -7,6 +7,7 @@ from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 import time
 import logging
+import pandas as pd
 import io
 import zipfile
 import csv
@@ -267,7 +268,9 @@ async def calculate_hsp(
         loss_function = calc_params.get('loss_function', 'cross_entropy')
         size_factor = calc_params.get('size_factor', 0.0)
 
-        # Perform HSP calculation with custom loss function and size_factor
+        # Perform HSP calculation with custom loss function and size_factor.
+        # The previous result is deliberately not used as a warm start, so the
+        # result depends only on the current tests and loss settings.
         result = hsp_calculator.calculate_hsp_from_tests(
             experiment.solvent_tests,
             loss_function=loss_function,
@@ -407,8 +410,10 @@ async def get_hansen_sphere_visualization(
         # DEBUG: Log input solvent data
         logger.info(f"🧪 INPUT SOLVENT DATA DEBUG:")
         logger.info(f"   Total solvents: {len(solvent_data)}")
-        for i, solvent in enumerate(solvent_data):
-            logger.info(f"   Solvent {i}: {solvent}")
+        # One table in a single log record instead of one record per solvent,
+        # only built when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + pd.DataFrame(solvent_data).to_string())
 
         # Generate Plotly visualization
         logger.debug(f"🎨 Generating Plotly visualization ({width}x{height})")
@@ -516,7 +521,7 @@ def create_sphere_test(approach_type: str, center, radius, solvent_data):
     """Create sphere visualization with different approaches"""
 
     # Generate sphere coordinates
-    sphere_coords = generate_test_sphere(center, radius, 25)
+    sphere_coords = generate_test_sphere(center, radius)
 
     # Create traces
     traces = []
@@ -686,9 +691,9 @@ def generate_test_sphere(center, radius, resolution=20):
     print(f"DEBUG generate_test_sphere: δH range=[{z.min():.2f}, {z.max():.2f}] (radius={radius:.2f})")
 
     return {
-        'x': x.tolist(),
-        'y': y.tolist(),
-        'z': z.tolist()
+        'x': np.round(x, 3).tolist(),
+        'y': np.round(y, 3).tolist(),
+        'z': np.round(z, 3).tolist()
     }
 
 
@@ -17,6 +17,7 @@ import zipfile
 import csv
 
 from app.services.solvent_service import solvent_service
+from app.utils.hansen import hansen_distance
 
 
 class SolventComponent(BaseModel):
@@ -41,16 +42,23 @@ router = APIRouter()
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 SOLVENT_DB_PATH = DATA_DIR / "solvents.csv"
 
+# Number of (pair, ratio) blend candidates evaluated per vectorized chunk
+BLEND_CHUNK_CANDIDATES = 1_000_000
+# Upper bound on the float32 rounding error of a blend's Hansen distance, used
+# when screening blend candidates before exact float64 ranking
+BLEND_SCREEN_TOLERANCE = 1e-4
+
 # Cache the solvent database
 _solvent_db = None
 _cache_timestamp = None
+_cache_mtime = None
 
 def get_solvent_database(request: Request = None):
     """
     Load and cache the solvent database including user-added solvents and saved mixtures
     Cache is reset when request includes ?reload=true
     """
-    global _solvent_db, _cache_timestamp
+    global _solvent_db, _cache_timestamp, _cache_mtime
     import time
 
     # Check if cache should be reset
@@ -59,12 +67,17 @@ def get_solvent_database(request: Request = None):
         should_reload = True
 
     current_time = time.time()
-    # Also auto-reload if cache is older than 60 seconds
+    # Also auto-reload if cache is older than 60 seconds, but only re-parse
+    # the CSV when the file has actually changed since it was loaded
     if _cache_timestamp and (current_time - _cache_timestamp) > 60:
-        should_reload = True
+        if SOLVENT_DB_PATH.stat().st_mtime != _cache_mtime:
+            should_reload = True
+        else:
+            _cache_timestamp = current_time
 
     if _solvent_db is None or should_reload:
         # Load main database
+        _cache_mtime = SOLVENT_DB_PATH.stat().st_mtime
         _solvent_db = pd.read_csv(SOLVENT_DB_PATH, encoding='utf-8-sig')
 
         # Note: User-added solvents are now managed in frontend localStorage
@@ -88,11 +101,7 @@ def calculate_red(delta_d1, delta_p1, delta_h1, delta_d2, delta_p2, delta_h2, ra
     RED ≈ 1: Partial solubility
     RED > 1: Poor solubility
     """
-    distance = np.sqrt(
-        4 * (delta_d1 - delta_d2)**2 +
-        (delta_p1 - delta_p2)**2 +
-        (delta_h1 - delta_h2)**2
-    )
+    distance = hansen_distance(delta_d1, delta_p1, delta_h1, delta_d2, delta_p2, delta_h2)
     return distance / ra if ra > 0 else distance
 
 
@@ -246,59 +255,107 @@ async def search_blend_solvents(
     # Filter out rows with missing HSP values
     df = df.dropna(subset=['delta_D', 'delta_P', 'delta_H'])
 
-    results = []
-
-    # Search for best blends
+    # Search for best blends over stacked arrays instead of per-row lookups
     n_solvents = len(df)
+    names = df['Solvent'].to_numpy()
+    hsp = df[['delta_D', 'delta_P', 'delta_H']].to_numpy(dtype=float)
+
+    # Try different ratios (0.1 to 0.9 in 0.1 increments)
+    ratios = np.arange(0.1, 1.0, 0.1)
+    n_ratios = len(ratios)
+    ra = target_radius if target_radius else 1.0
+
+    # All pairs i < j in the same order as nested loops over (i, j, ratio)
+    first, second = np.triu_indices(n_solvents, k=1)
+
+    # Screen all candidates in float32 (half the memory traffic), keeping every
+    # candidate that could still be in the top results within float32 rounding,
+    # then rank the survivors with exact float64 distances
+    hsp32 = hsp.astype(np.float32)
+    ratios32 = ratios.astype(np.float32)
+    screen_tol = BLEND_SCREEN_TOLERANCE / ra if ra > 0 else BLEND_SCREEN_TOLERANCE
+
+    best_distances = np.empty(0, dtype=np.float32)
+    best_order = np.empty(0, dtype=np.int64)
+    chunk_size = max(1, BLEND_CHUNK_CANDIDATES // n_ratios)
+
+    for start in range(0, len(first), chunk_size):
+        solvent1 = hsp32[first[start:start + chunk_size]]
+        solvent2 = hsp32[second[start:start + chunk_size]]
+
+        # (pairs, ratios) blend HSP values
+        blend = [
+            ratios32 * solvent1[:, [k]] + (1 - ratios32) * solvent2[:, [k]]
+            for k in range(3)
+        ]
+        distance = calculate_red(
+            target_delta_d, target_delta_p, target_delta_h,
+            blend[0], blend[1], blend[2],
+            ra=ra
+        ).ravel()
+        order = start * n_ratios + np.arange(distance.size)
+
+        # Only include blends that may be within target radius
+        if target_radius is not None:
+            within = distance <= 1.0 + screen_tol
+            distance = distance[within]
+            order = order[within]
+
+        # Keep only candidates that can still reach the best max_results
+        best_distances = np.concatenate((best_distances, distance))
+        best_order = np.concatenate((best_order, order))
+        if len(best_distances) > max_results:
+            cutoff = np.partition(best_distances, max_results - 1)[max_results - 1]
+            keep = best_distances <= cutoff + screen_tol
+            best_distances = best_distances[keep]
+            best_order = best_order[keep]
+
+    # Exact float64 distances for the surviving candidates
+    pair, ratio_index = np.divmod(best_order, n_ratios)
+    candidate_ratios = ratios[ratio_index][:, None]
+    blend = candidate_ratios * hsp[first[pair]] + (1 - candidate_ratios) * hsp[second[pair]]
+    best_distances = np.asarray(calculate_red(
+        target_delta_d, target_delta_p, target_delta_h,
+        blend[:, 0], blend[:, 1], blend[:, 2],
+        ra=ra
+    ))
 
-    for i in range(n_solvents):
-        solvent1 = df.iloc[i]
-
-        for j in range(i+1, n_solvents):
-            solvent2 = df.iloc[j]
-
-            # Try different ratios (0.1 to 0.9 in 0.1 increments)
-            for ratio in np.arange(0.1, 1.0, 0.1):
-                blend_delta_d = ratio * solvent1['delta_D'] + (1-ratio) * solvent2['delta_D']
-                blend_delta_p = ratio * solvent1['delta_P'] + (1-ratio) * solvent2['delta_P']
-                blend_delta_h = ratio * solvent1['delta_H'] + (1-ratio) * solvent2['delta_H']
-
-                distance = calculate_red(
-                    target_delta_d, target_delta_p, target_delta_h,
-                    blend_delta_d, blend_delta_p, blend_delta_h,
-                    ra=target_radius if target_radius else 1.0
-                )
-
-                # Only include blends within target radius
-                if target_radius is None or distance <= 1.0:
-                    results.append({
-                        'solvent1': {
-                            'name': solvent1['Solvent'],
-                            'delta_d': float(solvent1['delta_D']),
-                            'delta_p': float(solvent1['delta_P']),
-                            'delta_h': float(solvent1['delta_H']),
-                        },
-                        'solvent2': {
-                            'name': solvent2['Solvent'],
-                            'delta_d': float(solvent2['delta_D']),
-                            'delta_p': float(solvent2['delta_P']),
-                            'delta_h': float(solvent2['delta_H']),
-                        },
-                        'ratio': round(ratio, 2),
-                        'blend_hsp': {
-                            'delta_d': float(blend_delta_d),
-                            'delta_p': float(blend_delta_p),
-                            'delta_h': float(blend_delta_h),
-                        },
-                        'distance': float(distance),
-                        'red': float(distance),
-                    })
+    if target_radius is not None:
+        within = best_distances <= 1.0
+        best_distances = best_distances[within]
+        best_order = best_order[within]
 
-    # Sort by distance
-    results.sort(key=lambda x: x['distance'])
+    # Sort by distance (ties keep search order)
+    ranking = np.lexsort((best_order, best_distances))[:max_results]
 
-    # Limit results
-    results = results[:max_results]
+    results = []
+    for order, distance in zip(best_order[ranking], best_distances[ranking]):
+        pair, ratio_index = divmod(int(order), n_ratios)
+        i, j = first[pair], second[pair]
+        ratio = ratios[ratio_index]
+        blend_hsp = ratio * hsp[i] + (1 - ratio) * hsp[j]
+        results.append({
+            'solvent1': {
+                'name': names[i],
+                'delta_d': float(hsp[i, 0]),
+                'delta_p': float(hsp[i, 1]),
+                'delta_h': float(hsp[i, 2]),
+            },
+            'solvent2': {
+                'name': names[j],
+                'delta_d': float(hsp[j, 0]),
+                'delta_p': float(hsp[j, 1]),
+                'delta_h': float(hsp[j, 2]),
+            },
+            'ratio': round(ratio, 2),
+            'blend_hsp': {
+                'delta_d': float(blend_hsp[0]),
+                'delta_p': float(blend_hsp[1]),
+                'delta_h': float(blend_hsp[2]),
+            },
+            'distance': float(distance),
+            'red': float(distance),
+        })
 
     return {
         'results': results,
@@ -342,12 +399,19 @@ async def optimize_mixture(request: OptimizeRequest):
 
     target = np.array([request.target_delta_d, request.target_delta_p, request.target_delta_h])
 
+    # (n, 3) matrix so the mixture HSP is a single phi @ hsp_matrix product
+    hsp_matrix = np.column_stack((delta_d, delta_p, delta_h))
+    weights = np.array([4.0, 1.0, 1.0])
+
     def objective(phi):
         """Ra² = 4*(ΔδD)² + (ΔδP)² + (ΔδH)²"""
-        mix_d = np.dot(phi, delta_d)
-        mix_p = np.dot(phi, delta_p)
-        mix_h = np.dot(phi, delta_h)
-        return 4 * (mix_d - target[0])**2 + (mix_p - target[1])**2 + (mix_h - target[2])**2
+        diff = phi @ hsp_matrix - target
+        return np.einsum('i,i,i->', weights, diff, diff)
+
+    def gradient(phi):
+        """Analytic gradient of Ra², saving SLSQP the finite-difference evaluations"""
+        diff = phi @ hsp_matrix - target
+        return hsp_matrix @ (2.0 * weights * diff)
 
     # Constraint: sum of ratios = 1
     constraints = {'type': 'eq', 'fun': lambda phi: np.sum(phi) - 1}
@@ -364,6 +428,7 @@ async def optimize_mixture(request: OptimizeRequest):
         objective,
         x0,
         method='SLSQP',
+        jac=gradient,
         bounds=bounds,
         constraints=constraints,
         options={'ftol': 1e-10, 'maxiter': 1000}
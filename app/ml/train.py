@@ -72,9 +72,9 @@ To train and visualize results:
 import argparse
 import warnings
 import joblib
+from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 from datetime import datetime
 
@@ -84,6 +84,7 @@ from rdkit import Chem
 from rdkit.Chem import Descriptors
 from rdkit.ML.Descriptors import MoleculeDescriptors
 
+import sklearn
 from sklearn.model_selection import cross_val_predict, KFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import GradientBoostingRegressor
@@ -96,6 +97,11 @@ PROJECT_ROOT = SCRIPT_DIR.parent.parent
 DATA_PATH = PROJECT_ROOT / 'data' / 'original' / 'solvents' / 'Solvent List for calc.csv'
 MODEL_DIR = SCRIPT_DIR / 'models'
 REPORT_DIR = PROJECT_ROOT / 'docs'
+CV_CACHE_DIR = PROJECT_ROOT / '.cvcache'
+
+# Cross-validation results are deterministic (fixed random_state), so they are
+# persisted on disk keyed by the hashed inputs and reused across runs
+memory = joblib.Memory(CV_CACHE_DIR, verbose=0)
 
 
 def load_training_data() -> pd.DataFrame:
@@ -106,7 +112,12 @@ def load_training_data() -> pd.DataFrame:
         DataFrame with SMILES and target properties
     """
     print(f"Loading data from: {DATA_PATH}")
-    df = pd.read_csv(DATA_PATH, encoding='utf-8-sig')
+    # Only SMILES and the targets are used; skip parsing the other columns
+    df = pd.read_csv(
+        DATA_PATH,
+        encoding='utf-8-sig',
+        usecols=lambda c: c in ('Smiles', 'dD', 'dP', 'dH') or 'Tv' in c
+    )
 
     # Find Tv column (may have encoding issues)
     tv_col = [c for c in df.columns if 'Tv' in c][0]
@@ -164,6 +175,60 @@ def calculate_descriptors(smiles_list: list) -> tuple:
     return df_desc, valid_indices, list(df_desc.columns)
 
 
+def create_model() -> GradientBoostingRegressor:
+    """Create a GradientBoosting model with the fixed training parameters"""
+    return GradientBoostingRegressor(
+        n_estimators=100,
+        max_depth=5,
+        learning_rate=0.1,
+        random_state=42
+    )
+
+
+@memory.cache
+def cross_validate_target(X_scaled: np.ndarray, y: np.ndarray, model_params: dict,
+                          sklearn_version: str) -> np.ndarray:
+    """
+    Run 5-fold cross-validation for a single target
+
+    Results are cached on disk, so repeated runs with the same data return instantly.
+    joblib keys the cache on the arguments only, so the model parameters and the
+    scikit-learn version are passed in to invalidate it when either changes.
+
+    Args:
+        X_scaled: Standardized feature matrix
+        y: Target values
+        model_params: Parameters of the model from create_model().get_params()
+        sklearn_version: Installed scikit-learn version
+
+    Returns:
+        Cross-validated predictions
+    """
+    kfold = KFold(n_splits=5, shuffle=True, random_state=42)
+    return cross_val_predict(GradientBoostingRegressor(**model_params), X_scaled, y, cv=kfold)
+
+
+def fit_target(X_scaled: np.ndarray, y: np.ndarray) -> tuple:
+    """
+    Cross-validate and fit the final model for a single target
+
+    Args:
+        X_scaled: Standardized feature matrix
+        y: Target values
+
+    Returns:
+        Tuple of (cross-validated predictions, model trained on all data)
+    """
+    # Cross-validation predictions (cached on disk)
+    y_pred = cross_validate_target(X_scaled, y, create_model().get_params(), sklearn.__version__)
+
+    # Train final model on all data
+    model = create_model()
+    model.fit(X_scaled, y)
+
+    return y_pred, model
+
+
 def train_models(X: np.ndarray, df_targets: pd.DataFrame, visualize: bool = False) -> dict:
     """
     Train GradientBoosting models with cross-validation
@@ -189,9 +254,6 @@ def train_models(X: np.ndarray, df_targets: pd.DataFrame, visualize: bool = Fals
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
 
-    # Cross-validation setup
-    kfold = KFold(n_splits=5, shuffle=True, random_state=42)
-
     # Store results
     models = {}
     cv_results = {}
@@ -201,19 +263,13 @@ def train_models(X: np.ndarray, df_targets: pd.DataFrame, visualize: bool = Fals
     print("Training GradientBoosting Models (5-Fold Cross-Validation)")
     print("=" * 70)
 
-    for target in targets:
-        y = df_targets[target].values
-
-        # Create model
-        model = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=5,
-            learning_rate=0.1,
-            random_state=42
-        )
+    # The targets are independent, so fit them in parallel (one process each)
+    fitted = Parallel(n_jobs=len(targets))(
+        delayed(fit_target)(X_scaled, df_targets[target].values) for target in targets
+    )
 
-        # Cross-validation predictions
-        y_pred = cross_val_predict(model, X_scaled, y, cv=kfold)
+    for target, (y_pred, model) in zip(targets, fitted):
+        y = df_targets[target].values
 
         # Calculate metrics
         r2 = r2_score(y, y_pred)
@@ -226,8 +282,6 @@ def train_models(X: np.ndarray, df_targets: pd.DataFrame, visualize: bool = Fals
         print(f"  R2  = {r2:.3f}")
         print(f"  MAE = {mae:.2f} {target_units[target]}")
 
-        # Train final model on all data
-        model.fit(X_scaled, y)
         models[target] = model
 
     # Create visualizations if requested
@@ -244,6 +298,7 @@ def train_models(X: np.ndarray, df_targets: pd.DataFrame, visualize: bool = Fals
 def create_visualizations(predictions: dict, cv_results: dict,
                          target_names: dict, target_units: dict):
     """Create cross-validation result visualizations"""
+    import matplotlib.pyplot as plt
 
     print("\nGenerating visualizations...")
 
@@ -359,8 +414,25 @@ def create_visualizations(predictions: dict, cv_results: dict,
     plt.close()
 
 
+def compute_feature_importances(models: dict, feature_names: list) -> dict:
+    """Collect the top 20 features and their importances for each target"""
+    all_importances = {}
+
+    for target in ['dD', 'dP', 'dH', 'Tv']:
+        importances = models[target].feature_importances_
+        indices = np.argsort(importances)[::-1][:20]  # Top 20
+
+        all_importances[target] = {
+            'features': [feature_names[j] for j in indices],
+            'importances': importances[indices].tolist()
+        }
+
+    return all_importances
+
+
 def create_feature_importance_plots(models: dict, feature_names: list):
     """Create feature importance visualizations for each target"""
+    import matplotlib.pyplot as plt
 
     print("\nGenerating feature importance plots...")
 
@@ -373,25 +445,15 @@ def create_feature_importance_plots(models: dict, feature_names: list):
     }
     colors = {'dD': '#3498db', 'dP': '#2ecc71', 'dH': '#e74c3c', 'Tv': '#9b59b6'}
 
-    # Store importance data for all targets
-    all_importances = {}
+    all_importances = compute_feature_importances(models, feature_names)
 
     # Figure: Top 20 features for each target (2x2 subplot)
     fig, axes = plt.subplots(2, 2, figsize=(14, 12))
     axes = axes.flatten()
 
     for i, target in enumerate(targets):
-        model = models[target]
-        importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1][:20]  # Top 20
-
-        top_features = [feature_names[j] for j in indices]
-        top_importances = importances[indices]
-
-        all_importances[target] = {
-            'features': top_features,
-            'importances': top_importances.tolist()
-        }
+        top_features = all_importances[target]['features']
+        top_importances = all_importances[target]['importances']
 
         ax = axes[i]
         y_pos = np.arange(len(top_features))
@@ -446,13 +508,16 @@ def create_feature_importance_plots(models: dict, feature_names: list):
     return all_importances
 
 
-def save_models(result: dict, feature_names: list):
+def save_models(result: dict, feature_names: list, visualize: bool = False):
     """Save trained models and metadata"""
 
     MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Calculate feature importance
-    feature_importances = create_feature_importance_plots(result['models'], feature_names)
+    # Calculate feature importance (plots only when visualization is requested)
+    if visualize:
+        feature_importances = create_feature_importance_plots(result['models'], feature_names)
+    else:
+        feature_importances = compute_feature_importances(result['models'], feature_names)
 
     model_data = {
         'models': result['models'],
@@ -614,7 +679,7 @@ def main():
     result = train_models(X_desc.values, df_valid[['dD', 'dP', 'dH', 'Tv']], visualize=args.visualize)
 
     # Save models
-    save_models(result, feature_names)
+    save_models(result, feature_names, visualize=args.visualize)
 
     # Generate report
     generate_report(result['cv_results'], len(df_valid), len(feature_names))
@@ -7,6 +7,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import math
 
+from app.utils.hansen import hansen_distance
 from .solvent_models import SolventTest, SolubilityType
 
 
@@ -33,11 +34,10 @@ class HSPValues(BaseModel):
         Calculate Relative Energy Difference (RED) with another HSP
         RED = Ra / R0, where Ra is the distance and R0 is the interaction radius
         """
-        ra = math.sqrt(
-            4 * (self.delta_d - other_hsp.delta_d)**2 +
-            (self.delta_p - other_hsp.delta_p)**2 +
-            (self.delta_h - other_hsp.delta_h)**2
-        )
+        ra = float(hansen_distance(
+            self.delta_d, self.delta_p, self.delta_h,
+            other_hsp.delta_d, other_hsp.delta_p, other_hsp.delta_h
+        ))
         return ra / self.radius if self.radius > 0 else float('inf')
 
     def is_compatible(self, other_hsp: 'HSPValues') -> bool:
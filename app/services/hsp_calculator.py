@@ -2,14 +2,82 @@
 HSP Calculator Service using HSPiPy library
 """
 
+import hashlib
+import numpy as np
 import pandas as pd
 import tempfile
 import os
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
 from hspipy import HSP, HSPEstimator
+from scipy.optimize import differential_evolution
 
 from app.models.hsp_models import SolventTest, HSPCalculationResult
 from app.services.theory_based_loss import get_loss_function
+from app.utils.hansen import hansen_distance
+
+# Differential evolution generation limit (log_barrier needs over 1000 generations)
+DE_MAXITER = 3000
+
+# Fixed seed so recalculating the same data gives the same result
+DE_SEED = 42
+
+# Number of recent calculation results kept for identical repeated requests
+RESULT_CACHE_SIZE = 32
+
+
+class SeededHSPEstimator(HSPEstimator):
+    """
+    HSPEstimator whose differential evolution runs with its own seeded generator
+
+    HSPiPy does not expose DE's seed, so _differential_evolution_fit is
+    reimplemented from HSPiPy 1.1.8 (pinned in requirements.txt, together with
+    the private _get_loss_function, _get_bounds, _get_initial_guess and
+    _get_datafit helpers it calls) and passes an explicit rng to SciPy
+    (the rng keyword needs SciPy >= 1.15).
+    """
+
+    seed = None
+
+    def _differential_evolution_fit(self, X, y):
+        if self.seed is None:
+            return super()._differential_evolution_fit(X, y)
+
+        X_good = X[y == 1, :3]
+        if X_good.shape[0] < self.n_spheres:
+            raise ValueError("Not enough inside solvents to form the required number of spheres.")
+
+        loss_func = self._get_loss_function()
+
+        def objective(array):
+            return loss_func(array, X, y)
+
+        # Same options as HSPiPy (vectorized population calls need deferred
+        # updating and a single worker), plus the seeded generator
+        result = differential_evolution(
+            objective,
+            bounds=self._get_bounds(),
+            strategy=self.de_strategy,
+            maxiter=self.de_maxiter,
+            popsize=self.de_popsize,
+            tol=self.de_tol,
+            mutation=self.de_mutation,
+            recombination=self.de_recombination,
+            init=self.de_init,
+            atol=self.de_atol,
+            updating='deferred',
+            workers=1,
+            x0=self._get_initial_guess(X_good),
+            vectorized=True,
+            rng=np.random.default_rng(self.seed)
+        )
+
+        self.hsp_ = result.x.reshape(self.n_spheres, 4)
+        self.error_ = result.fun
+        self.optimization_result_ = result
+        self.datafit_ = self._get_datafit(X, y)
+
+        return self
 
 
 class HSPCalculator:
@@ -17,13 +85,15 @@ class HSPCalculator:
 
     def __init__(self):
         self.hsp_engine = None
+        self._result_cache = OrderedDict()
 
     def calculate_hsp_from_tests(
         self,
         solvent_tests: List[SolventTest],
         inside_limit: int = 1,
         loss_function: str = "cross_entropy",
-        size_factor: float = 0.0
+        size_factor: float = 0.0,
+        arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
     ) -> Optional[HSPCalculationResult]:
         """
         Calculate HSP values from solvent test data
@@ -35,6 +105,8 @@ class HSPCalculator:
                           Special mode: 'optimize_radius_only' - Uses Cross Entropy for center,
                           then optimizes R0 (interaction radius) only to maximize FIT
             size_factor: Size penalty factor (default: 0.0)
+            arrays: Optional precomputed result of _convert_tests_to_arrays(solvent_tests),
+                    so callers that already converted the tests skip the solvent lookups
 
         Returns:
             HSPCalculationResult or None if calculation fails
@@ -44,21 +116,37 @@ class HSPCalculator:
         if loss_function == 'optimize_radius_only':
             return self._calculate_hsp_optimize_radius_only(solvent_tests)
         try:
-            # Convert solvent tests to HSPiPy format
-            hsp_data = self._convert_tests_to_hsp_format(solvent_tests)
+            # Convert solvent tests to the arrays used for fitting
+            if arrays is None:
+                arrays = self._convert_tests_to_arrays(solvent_tests)
+            X, y, names = arrays
 
-            if len(hsp_data) < 2:
+            if len(y) < 2:
                 raise ValueError("At least 2 solvent tests are required for HSP calculation")
 
-            # Create temporary CSV file
+            # The fit is deterministic (seeded DE), so a repeated calculation with
+            # identical tests and loss settings is answered from the cache instead of refitting
+            good_solvents = sum(1 for t in solvent_tests if t.solubility == 'soluble')
+            cache_key = (
+                loss_function,
+                size_factor,
+                hashlib.sha1(X.tobytes() + y.tobytes()).hexdigest(),
+                len(solvent_tests),
+                good_solvents
+            )
+            cached_result = self._result_cache.get(cache_key)
+            if cached_result is not None:
+                self._result_cache.move_to_end(cache_key)
+                print("Debug: Returning cached HSP result for identical input")
+                return cached_result.model_copy(deep=True)
+
+            # Create temporary CSV file (HSPiPy format, kept for debugging)
+            hsp_data = self._arrays_to_hsp_format(X, y, names)
             with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp_file:
                 tmp_filename = tmp_file.name
                 hsp_data.to_csv(tmp_filename, index=False)
 
             try:
-                # Prepare data for fitting
-                X = hsp_data[['D', 'P', 'H']].values
-                y = hsp_data['Data'].values
 
                 # Check if using HSPiPy default (classic DATAFIT method)
                 if loss_function == 'hspipy_default':
@@ -72,13 +160,7 @@ class HSPCalculator:
                     loss_func = get_loss_function(loss_function, size_factor=size_factor if size_factor > 0 else None)
 
                     # Use HSPEstimator with custom loss function
-                    estimator = HSPEstimator(
-                        n_spheres=1,
-                        method='differential_evolution',
-                        loss=loss_func,
-                        de_maxiter=3000,
-                        de_workers=1
-                    )
+                    estimator = self._get_de_estimator(loss_func)
 
                 # Perform calculation
                 estimator.fit(X, y)
@@ -133,6 +215,23 @@ class HSPCalculator:
                 else:
                     raise ValueError("Failed to extract HSP results from fitted model")
 
+                # Report the data and radius terms of the fitted loss separately, so the
+                # effect of another size_factor (base_loss + size_factor * radius_penalty)
+                # can be judged without refitting
+                loss_terms = None
+                if loss_function != 'hspipy_default':
+                    base_loss, radius_penalty = loss_func.decompose(hsp_info)
+                    loss_terms = {
+                        "base_loss": float(base_loss),
+                        "radius_penalty": float(radius_penalty)
+                    }
+
+                # Only scalars are needed from here on; release the loss data buffers
+                # (the reused DE estimator keeps only its small fitted result)
+                if loss_function != 'hspipy_default':
+                    loss_func.clear_data()
+                del estimator, hsp
+
                 # Determine optimization method name for display
                 if loss_function == 'hspipy_default':
                     optimization_method = "classic"
@@ -152,13 +251,15 @@ class HSPCalculator:
                     data_fit=data_fit,
                     method=method_display,
                     solvent_count=len(solvent_tests),
-                    good_solvents=len([t for t in solvent_tests if t.solubility == 'soluble']),
+                    good_solvents=good_solvents,
                     calculation_details={
                         "loss_function": loss_function,
                         "size_factor": size_factor,
                         "optimization_method": optimization_method,
                         "sphere_model": "single",
-                        "maxiter": 3000 if optimization_method == "differential_evolution" else None
+                        "maxiter": DE_MAXITER if optimization_method == "differential_evolution" else None,
+                        "seed": DE_SEED if optimization_method == "differential_evolution" else None,
+                        "loss_terms": loss_terms
                     }
                 )
 
@@ -166,6 +267,10 @@ class HSPCalculator:
                 print(f"Debug: HSP calculation data saved to: {tmp_filename}")
                 print(f"Debug: File contains {len(hsp_data)} records")
 
+                self._result_cache[cache_key] = result.model_copy(deep=True)
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+
                 return result
 
             finally:
@@ -178,17 +283,42 @@ class HSPCalculator:
             print(f"HSP calculation error: {e}")
             return None
 
-    def _convert_tests_to_hsp_format(self, solvent_tests: List[SolventTest]) -> pd.DataFrame:
+    def _get_de_estimator(self, loss_func) -> SeededHSPEstimator:
         """
-        Convert MixingCompass solvent test data to HSPiPy format
+        Return the differential evolution estimator, configured for this fit
+
+        One estimator is kept in self.hsp_engine and reconfigured with
+        set_params() instead of being constructed again for every calculation.
+        """
+        if self.hsp_engine is None:
+            # HSPiPy always runs differential_evolution with vectorized=True, which
+            # SciPy cannot combine with workers > 1: the whole population is already
+            # evaluated in one call of the batch loss, so a process pool would only
+            # add pickling overhead. Keep a single worker.
+            self.hsp_engine = SeededHSPEstimator(
+                n_spheres=1,
+                method='differential_evolution',
+                de_workers=1
+            )
+
+        self.hsp_engine.set_params(loss=loss_func, de_maxiter=DE_MAXITER)
+        self.hsp_engine.seed = DE_SEED
+        return self.hsp_engine
+
+    def _convert_tests_to_arrays(self, solvent_tests: List[SolventTest]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert MixingCompass solvent test data to raw NumPy arrays
 
         Args:
             solvent_tests: List of solvent test data
 
         Returns:
-            DataFrame in HSPiPy format
+            Tuple of (X as contiguous (n, 3) float array of D/P/H,
+            y as solubility values, solvent names)
         """
-        hsp_rows = []
+        names = []
+        coordinates = []
+        values = []
 
         for test in solvent_tests:
             # Get HSP values (from manual entry or database lookup)
@@ -204,15 +334,23 @@ class HSPCalculator:
             if data_value is None:
                 continue
 
-            hsp_rows.append({
-                'Chemical': test.solvent_name,
-                'D': delta_d,
-                'P': delta_p,
-                'H': delta_h,
-                'Data': data_value
-            })
+            names.append(test.solvent_name)
+            coordinates.append((delta_d, delta_p, delta_h))
+            values.append(data_value)
+
+        X = np.ascontiguousarray(np.array(coordinates, dtype=np.float64).reshape(-1, 3))
+        y = np.array(values, dtype=np.float64)
+        return X, y, np.array(names, dtype=object)
 
-        return pd.DataFrame(hsp_rows)
+    def _arrays_to_hsp_format(self, X: np.ndarray, y: np.ndarray, names: np.ndarray) -> pd.DataFrame:
+        """Build the HSPiPy-format DataFrame (Chemical, D, P, H, Data) from raw arrays"""
+        return pd.DataFrame({
+            'Chemical': names,
+            'D': X[:, 0],
+            'P': X[:, 1],
+            'H': X[:, 2],
+            'Data': y
+        })
 
     def _extract_hsp_values(self, test: SolventTest) -> Tuple[Optional[float], Optional[float], Optional[float]]:
         """
@@ -374,12 +512,17 @@ class HSPCalculator:
         try:
             print("\n=== Optimize Radius Only Mode ===")
 
+            # Resolve solvent HSP values once; both the center fit and the
+            # distance steps below work on the same arrays
+            X, y, names = self._convert_tests_to_arrays(solvent_tests)
+
             # Step 1: Calculate center using Cross Entropy
             print("Step 1: Calculate center using Cross Entropy")
             center_result = self.calculate_hsp_from_tests(
                 solvent_tests,
                 loss_function='cross_entropy',
-                size_factor=0.0
+                size_factor=0.0,
+                arrays=(X, y, names)
             )
 
             if not center_result:
@@ -394,52 +537,51 @@ class HSPCalculator:
 
             # Step 2: Convert solvent tests to format with distances
             print("\nStep 2: Calculate Hansen distances")
-            hsp_data = self._convert_tests_to_hsp_format(solvent_tests)
 
-            if len(hsp_data) < 2:
+            if len(y) < 2:
                 raise ValueError("At least 2 solvent tests are required")
 
             center = (center_d, center_p, center_h)
 
-            solvents = []
-            for _, row in hsp_data.iterrows():
-                distance = self._calculate_hansen_distance(
-                    (row['D'], row['P'], row['H']),
-                    center
-                )
-                solvents.append({
-                    'name': row['Chemical'],
-                    'delta_d': row['D'],
-                    'delta_p': row['P'],
-                    'delta_h': row['H'],
-                    'solubility': row['Data'],
+            # Distances to the fixed center for all solvents in one array expression
+            distances = hansen_distance(X[:, 0], X[:, 1], X[:, 2], *center)
+
+            solvents = [
+                {
+                    'name': name,
+                    'delta_d': delta_d,
+                    'delta_p': delta_p,
+                    'delta_h': delta_h,
+                    'solubility': solubility,
                     'distance': distance
-                })
+                }
+                for name, (delta_d, delta_p, delta_h), solubility, distance
+                in zip(names, X, y, distances.tolist())
+            ]
 
-            # Classify solvents
-            good_solvents = [s for s in solvents if s['solubility'] == 1.0]
-            poor_solvents = [s for s in solvents if s['solubility'] < 1.0]
+            # Classify solvents with one boolean mask shared by both partitions
+            is_good = y == 1.0
+            n_good = int(is_good.sum())
+            n_poor = len(y) - n_good
 
-            print(f"\nGood solvents (sol=1.0): {len(good_solvents)}")
-            print(f"Poor solvents (sol<1.0): {len(poor_solvents)}")
+            print(f"\nGood solvents (sol=1.0): {n_good}")
+            print(f"Poor solvents (sol<1.0): {n_poor}")
 
             # Step 3: Calculate constraints
             print("\nStep 3: Calculate Ra constraints")
 
-            if good_solvents:
-                good_distances = [s['distance'] for s in good_solvents]
-                Ra_min = max(good_distances)
-                furthest_good = max(good_solvents, key=lambda x: x['distance'])
+            if n_good:
+                furthest_good = solvents[int(np.where(is_good, distances, -np.inf).argmax())]
+                Ra_min = furthest_good['distance']
                 print(f"Ra_min = {Ra_min:.4f} (furthest good: {furthest_good['name']})")
             else:
                 Ra_min = 0.1
                 furthest_good = None
                 print(f"Ra_min = {Ra_min:.4f} (default, no good solvents)")
 
-            if poor_solvents:
-                poor_distances = [s['distance'] for s in poor_solvents]
-                Ra_max = min(poor_distances)
-                closest_poor = min(poor_solvents, key=lambda x: x['distance'])
+            if n_poor:
+                closest_poor = solvents[int(np.where(is_good, np.inf, distances).argmin())]
+                Ra_max = closest_poor['distance']
                 print(f"Ra_max = {Ra_max:.4f} (closest poor: {closest_poor['name']}, sol={closest_poor['solubility']})")
             else:
                 Ra_max = float('inf')
@@ -474,33 +616,25 @@ class HSPCalculator:
             # Step 5: Calculate final metrics
             print("\nStep 5: Calculate final metrics")
 
-            correct = 0
             total = len(solvents)
 
-            classification_details = []
+            # Classify every solvent at once; good solvents must be inside, the rest outside
+            RED = distances / Ra_optimal
+            is_inside = RED < 1.0
+            is_correct = is_inside == is_good
+            correct = int(is_correct.sum())
 
-            for s in solvents:
-                RED = s['distance'] / Ra_optimal
-                is_inside = RED < 1.0
-
-                if s['solubility'] == 1.0:
-                    # Good solvent
-                    is_correct = is_inside
-                else:
-                    # Poor solvent
-                    is_correct = not is_inside
-
-                if is_correct:
-                    correct += 1
-
-                classification_details.append({
+            classification_details = [
+                {
                     'name': s['name'],
                     'solubility': float(s['solubility']),
                     'distance': float(s['distance']),
-                    'RED': float(RED),
-                    'is_inside': bool(is_inside),
-                    'is_correct': bool(is_correct)
-                })
+                    'RED': red,
+                    'is_inside': inside,
+                    'is_correct': ok
+                }
+                for s, red, inside, ok in zip(solvents, RED.tolist(), is_inside.tolist(), is_correct.tolist())
+            ]
 
             fit = correct / total if total > 0 else 0.0
 
@@ -518,7 +652,7 @@ class HSPCalculator:
                 data_fit=fit,
                 method="Cross Entropy → Ra Optimized (Cover All Soluble)",
                 solvent_count=len(solvent_tests),
-                good_solvents=len(good_solvents),
+                good_solvents=n_good,
                 calculation_details={
                     "optimization_method": "radius_only_minimum_sphere",
                     "base_center": "cross_entropy",
@@ -539,8 +673,8 @@ class HSPCalculator:
                     },
                     "statistics": {
                         "total_solvents": total,
-                        "good_solvents": len(good_solvents),
-                        "poor_solvents": len(poor_solvents),
+                        "good_solvents": n_good,
+                        "poor_solvents": n_poor,
                         "correct_classifications": correct,
                         "incorrect_classifications": total - correct,
                         "FIT": fit
@@ -579,15 +713,7 @@ class HSPCalculator:
         Note: This calculates Ra (distance), not R0 (interaction radius).
         RED = Ra / R0 is used to determine solubility.
         """
-        import math
-
-        delta_D = point[0] - center[0]
-        delta_P = point[1] - center[1]
-        delta_H = point[2] - center[2]
-
-        distance = math.sqrt(4 * delta_D**2 + delta_P**2 + delta_H**2)
-
-        return distance
+        return float(hansen_distance(*point, *center))
 
     def _optimize_radius_maximize_fit(
         self,
@@ -607,8 +733,6 @@ class HSPCalculator:
         This follows the internal convention where 'radius' parameter represents R0.
         """
 
-        import numpy as np
-
         print(f"\n  Searching optimal Ra in range [{Ra_max-1.0:.4f}, {Ra_min+1.0:.4f}]")
 
         # Search range
@@ -627,14 +751,13 @@ class HSPCalculator:
             correct = 0
             total = len(good_solvents) + len(poor_solvents)
 
+            # RED < 1 is equivalent to distance < Ra, so skip the division
             for s in good_solvents:
-                RED = s['distance'] / Ra
-                if RED < 1.0:  # Inside (correct)
+                if s['distance'] < Ra:  # Inside (correct)
                     correct += 1
 
             for s in poor_solvents:
-                RED = s['distance'] / Ra
-                if RED > 1.0:  # Outside (correct)
+                if s['distance'] > Ra:  # Outside (correct)
                     correct += 1
 
             fit = correct / total if total > 0 else 0.0
@@ -651,6 +774,10 @@ class HSPCalculator:
 
         return best_Ra
 
+    def clear_cache(self):
+        """Forget cached calculation results, so the next calculation refits"""
+        self._result_cache.clear()
+
     def get_calculation_parameters(self) -> Dict[str, any]:
         """
         Get available calculation parameters and their descriptions
@@ -135,7 +135,7 @@ class PolymerService:
 
         self._indexed_data = {}
 
-        for _, row in self._data.iterrows():
+        for row in self._data.to_dict('records'):
             try:
                 polymer_data = self._row_to_polymer_data(row)
 
@@ -150,8 +150,8 @@ class PolymerService:
             except Exception as e:
                 logger.warning(f"Error indexing polymer {row.get('Polymer', 'unknown')}: {e}")
 
-    def _row_to_polymer_data(self, row: pd.Series) -> PolymerData:
-        """Convert DataFrame row to PolymerData model"""
+    def _row_to_polymer_data(self, row: Dict[str, Any]) -> PolymerData:
+        """Convert a DataFrame record (column -> value dict) to PolymerData model"""
 
         return PolymerData(
             polymer=str(row['Polymer']),
@@ -188,7 +188,7 @@ class PolymerService:
             return []
 
         polymers = []
-        for _, row in self._data.iterrows():
+        for row in self._data.to_dict('records'):
             try:
                 polymer_data = self._row_to_polymer_data(row)
                 polymers.append(polymer_data)
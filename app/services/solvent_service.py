@@ -123,7 +123,7 @@ class SolventService:
 
         self._indexed_data = {}
 
-        for _, row in self._data.iterrows():
+        for row in self._data.to_dict('records'):
             try:
                 solvent_data = self._row_to_solvent_data(row)
 
@@ -138,8 +138,8 @@ class SolventService:
             except Exception as e:
                 logger.warning(f"Error indexing solvent {row.get('Solvent', 'unknown')}: {e}")
 
-    def _row_to_solvent_data(self, row: pd.Series) -> SolventData:
-        """Convert DataFrame row to SolventData model"""
+    def _row_to_solvent_data(self, row: Dict[str, Any]) -> SolventData:
+        """Convert a DataFrame record (column -> value dict) to SolventData model"""
 
         return SolventData(
             solvent=str(row['Solvent']),
@@ -259,7 +259,7 @@ class SolventService:
 
         # Convert to SolventData objects
         solvents = []
-        for _, row in df_page.iterrows():
+        for row in df_page.to_dict('records'):
             try:
                 solvent_data = self._row_to_solvent_data(row)
                 solvents.append(solvent_data)
@@ -2,15 +2,390 @@
 Theory-based loss functions with NO arbitrary parameters
 All based purely on Hansen solubility theory (RED=1 boundary)
 """
+import math
+
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; the NumPy implementations are used instead
+    NUMBA_AVAILABLE = False
+    prange = range
+
+
+# Upper bound on the number of (sample, candidate) RED values evaluated at once
+# by the batch path (256 KiB of float32)
+BATCH_CHUNK_ELEMENTS = 65536
+
+
+# Solubility class codes used by the kernels instead of float label comparisons
+Y_POOR, Y_PARTIAL, Y_GOOD = 0, 1, 2
+
+
+def encode_y(y):
+    """Encode solubility values as uint8 class codes (0=poor, 1=partial, 2=good)."""
+    y = np.asarray(y)
+    return np.where(y == 1.0, Y_GOOD, np.where(y == 0.0, Y_POOR, Y_PARTIAL)).astype(np.uint8)
+
+
+def _jit(func):
+    """Compile a numeric kernel with Numba when it is installed."""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, fastmath=True)(func)
+    return func
+
+
+def _jit_parallel(func):
+    """Compile a numeric kernel with Numba's parallel prange support when installed."""
+    if NUMBA_AVAILABLE:
+        return njit(parallel=True, cache=True, fastmath=True)(func)
+    return func
+
+
+def squared_hansen_distance(X, center):
+    """Calculate squared Hansen distance from center (no sqrt)."""
+    # Per-axis differences avoid the (N, 3) squared temporary
+    dx = X[:, 0] - center[0]
+    dy = X[:, 1] - center[1]
+    dz = X[:, 2] - center[2]
+    return dx * dx + dy * dy + dz * dz
+
 
 def hansen_distance(X, center):
     """Calculate Hansen distance from center."""
-    return np.sqrt(np.sum((X - center)**2, axis=1))
+    return np.sqrt(squared_hansen_distance(X, center))
+
+
+@_jit
+def _proportional_boundary_kernel(D, P, H, R, Xd, Xp, Xh, y):
+    """Mean y-weighted boundary penalty in a single pass over X (no temporaries)."""
+    n = Xd.shape[0]
+    total = 0.0
+    for i in range(n):
+        dx = Xd[i] - D
+        dy = Xp[i] - P
+        dz = Xh[i] - H
+        red = math.sqrt(dx * dx + dy * dy + dz * dz) / R
+        if red > 1.0:
+            total += y[i] * (red - 1.0)
+        else:
+            total += (1.0 - y[i]) * (1.0 - red)
+    return total / n
+
+
+@_jit
+def _boundary_distance_kernel(D, P, H, R, Xd, Xp, Xh, y_class):
+    """Mean boundary distance loss in a single pass over X"""
+    n = Xd.shape[0]
+    R2 = R * R
+    total = 0.0
+    for i in range(n):
+        dx = Xd[i] - D
+        dy = Xp[i] - P
+        dz = Xh[i] - H
+        d2 = dx * dx + dy * dy + dz * dz
+        # Samples on their correct side contribute nothing: decide on d² and
+        # only take the sqrt when a penalty is due
+        if y_class[i] == Y_GOOD:
+            if d2 > R2:
+                total += math.sqrt(d2) / R - 1.0
+        elif y_class[i] == Y_POOR:
+            if d2 < R2:
+                total += 1.0 - math.sqrt(d2) / R
+        else:
+            total += abs(math.sqrt(d2) / R - 1.0)
+    return total / n
+
+
+@_jit
+def _log_barrier_kernel(D, P, H, R, Xd, Xp, Xh, y_class, epsilon):
+    """Mean logarithmic barrier loss in a single pass over X"""
+    n = Xd.shape[0]
+    total = 0.0
+    for i in range(n):
+        dx = Xd[i] - D
+        dy = Xp[i] - P
+        dz = Xh[i] - H
+        red = math.sqrt(dx * dx + dy * dy + dz * dz) / R
+        if y_class[i] == Y_GOOD:
+            if red < 1.0 - epsilon:
+                total += -math.log(1.0 - red + epsilon)
+            else:
+                total += 10.0 * (red - 1.0 + epsilon)
+        elif y_class[i] == Y_POOR:
+            if red > 1.0 + epsilon:
+                total += -math.log(red - 1.0 + epsilon)
+            else:
+                total += 10.0 * (1.0 + epsilon - red)
+        else:
+            total += abs(red - 1.0)
+    return total / n
+
+
+@_jit
+def _normalized_distance_kernel(D, P, H, R, Xd, Xp, Xh, y_class):
+    """Mean normalized distance loss in a single pass over X"""
+    n = Xd.shape[0]
+    total = 0.0
+    for i in range(n):
+        dx = Xd[i] - D
+        dy = Xp[i] - P
+        dz = Xh[i] - H
+        red = math.sqrt(dx * dx + dy * dy + dz * dz) / R
+        if y_class[i] == Y_GOOD:
+            total += red
+        elif y_class[i] == Y_POOR:
+            total += 1.0 / (red + 1e-6)
+        else:
+            total += abs(red - 1.0)
+    return total / n
+
+
+@_jit
+def _cross_entropy_kernel(D, P, H, R, Xd, Xp, Xh, y):
+    """Mean cross-entropy loss with p(soluble) = 1 / (1 + RED²) in a single pass over X"""
+    n = Xd.shape[0]
+    total = 0.0
+    for i in range(n):
+        dx = Xd[i] - D
+        dy = Xp[i] - P
+        dz = Xh[i] - H
+        red2 = (dx * dx + dy * dy + dz * dz) / (R * R)
+        p_soluble = min(max(1.0 / (1.0 + red2), 1e-7), 1.0 - 1e-7)
+        total -= y[i] * math.log(p_soluble) + (1.0 - y[i]) * math.log(1.0 - p_soluble)
+    return total / n
+
+
+# Population kernels: evaluate a (4, S) population with one single-pass kernel
+# call per candidate, spread over the cores with prange. Each loss gets its own
+# module-level function so Numba can cache the compiled code on disk.
+
+@_jit_parallel
+def _proportional_boundary_population(HSP, Xd, Xp, Xh, y):
+    out = np.empty(HSP.shape[1])
+    for m in prange(HSP.shape[1]):
+        out[m] = _proportional_boundary_kernel(HSP[0, m], HSP[1, m], HSP[2, m], HSP[3, m], Xd, Xp, Xh, y)
+    return out
+
+
+@_jit_parallel
+def _boundary_distance_population(HSP, Xd, Xp, Xh, y_class):
+    out = np.empty(HSP.shape[1])
+    for m in prange(HSP.shape[1]):
+        out[m] = _boundary_distance_kernel(HSP[0, m], HSP[1, m], HSP[2, m], HSP[3, m], Xd, Xp, Xh, y_class)
+    return out
+
+
+@_jit_parallel
+def _log_barrier_population(HSP, Xd, Xp, Xh, y_class, epsilon):
+    out = np.empty(HSP.shape[1])
+    for m in prange(HSP.shape[1]):
+        out[m] = _log_barrier_kernel(HSP[0, m], HSP[1, m], HSP[2, m], HSP[3, m], Xd, Xp, Xh, y_class, epsilon)
+    return out
+
+
+@_jit_parallel
+def _normalized_distance_population(HSP, Xd, Xp, Xh, y_class):
+    out = np.empty(HSP.shape[1])
+    for m in prange(HSP.shape[1]):
+        out[m] = _normalized_distance_kernel(HSP[0, m], HSP[1, m], HSP[2, m], HSP[3, m], Xd, Xp, Xh, y_class)
+    return out
+
+
+@_jit_parallel
+def _cross_entropy_population(HSP, Xd, Xp, Xh, y):
+    out = np.empty(HSP.shape[1])
+    for m in prange(HSP.shape[1]):
+        out[m] = _cross_entropy_kernel(HSP[0, m], HSP[1, m], HSP[2, m], HSP[3, m], Xd, Xp, Xh, y)
+    return out
+
+
+class BaseTheoryLoss:
+    """
+    Common base for the theory-based losses
+
+    X and y stay fixed for the whole optimization while only the HSP
+    candidate changes, so the y-dependent terms are computed once per
+    data set and reused on every call.
+    """
+
+    def __init__(self, size_factor=None):
+        self.size_factor = size_factor
+        self._X = None
+        self._y = None
+
+    def set_data(self, X, y):
+        """Precompute the data-dependent buffers used by __call__"""
+        self._X = X
+        self._y = y
+        # Structure-of-arrays float32 columns: three contiguous streams at half
+        # the bytes (HSP values are only meaningful to ~0.01 MPa^0.5)
+        self._Xd = np.ascontiguousarray(X[:, 0], dtype=np.float32)
+        self._Xp = np.ascontiguousarray(X[:, 1], dtype=np.float32)
+        self._Xh = np.ascontiguousarray(X[:, 2], dtype=np.float32)
+        # Batch path expands |x - c|² = |x|² - 2 x·c + |c|², so the per-sample |x|²
+        # is computed once here and each population needs a single (n, 3) @ (3, S)
+        # product. Coordinates are shifted to their mean to limit the float32
+        # cancellation of that expansion.
+        X32 = np.column_stack((self._Xd, self._Xp, self._Xh))
+        self._X_offset = X32.mean(axis=0)
+        self._X_shifted = X32 - self._X_offset
+        self._x_sq_col = np.einsum('ij,ij->i', self._X_shifted, self._X_shifted)[:, None]
+        self._y_f64 = np.ascontiguousarray(y, dtype=np.float64)
+        self._one_minus_y = 1.0 - self._y_f64
+        # Label columns shaped (n_samples, 1) to broadcast against the float32
+        # (n_samples, S) RED buffers of the batch path
+        self._y_col = self._y_f64.astype(np.float32)[:, None]
+        self._one_minus_y_col = self._one_minus_y.astype(np.float32)[:, None]
+        # Classify once per data set; the kernels and masks reuse the codes
+        self._y_class = encode_y(self._y_f64)
+        self._good_col = (self._y_class == Y_GOOD)[:, None]
+        self._poor_col = (self._y_class == Y_POOR)[:, None]
+        # HSPiPy binarizes y before fitting, so the partial branch is usually empty
+        self._has_partial = bool(np.any(self._y_class == Y_PARTIAL))
+
+    def clear_data(self):
+        """Release the cached buffers once fitting is finished"""
+        self._X = None
+        self._y = None
+        self._Xd = self._Xp = self._Xh = None
+        self._X_offset = self._X_shifted = self._x_sq_col = None
+        self._y_f64 = self._one_minus_y = self._y_class = None
+        self._y_col = self._one_minus_y_col = None
+        self._good_col = self._poor_col = None
+        self._has_partial = None
+
+    def _ensure_data(self, X, y):
+        """Refresh the cached buffers only when called with a new data set"""
+        if X is not self._X or y is not self._y:
+            self.set_data(X, y)
+
+    def __call__(self, HSP, X, y):
+        base_loss, radius_penalty = self.decompose(HSP, X, y)
 
+        if self.size_factor is not None and self.size_factor > 0:
+            return base_loss + self.size_factor * radius_penalty
 
-class BoundaryDistanceLoss:
+        return base_loss
+
+    def decompose(self, HSP, X=None, y=None):
+        """
+        Split the loss into its data term and its radius term
+
+        The total loss is base_loss + size_factor * radius_penalty, so several
+        size_factor values can be compared from a single evaluation.
+
+        Args:
+            HSP: (δD, δP, δH, R0) or an array of shape (4, S) of candidates
+            X: Solvent HSP values of shape (n_samples, 3)
+               (default: the data of the last evaluation, e.g. the fitted data)
+            y: Solubility values (default: the data of the last evaluation)
+
+        Returns:
+            Tuple of (base_loss, radius_penalty), scalars or arrays of shape (S,)
+        """
+        if X is None or y is None:
+            X, y = self._X, self._y
+        self._ensure_data(X, y)
+        if np.ndim(HSP) == 2:
+            base_loss = self._batch_base_loss(HSP)
+        else:
+            base_loss = self._scalar_base_loss(HSP)
+        return base_loss, HSP[3] ** 2
+
+    # Single-pass Numba kernel for one candidate (Numba only), called with
+    # (D, P, H, R, Xd, Xp, Xh, labels) plus any _scalar_kernel_args(), where
+    # labels are the y values or, for class-based losses, the encode_y() codes
+    _scalar_kernel = None
+    _kernel_uses_class_codes = False
+
+    # Parallel Numba kernel for a (4, S) population (Numba only), called with
+    # (HSP, Xd, Xp, Xh, labels) plus any _scalar_kernel_args()
+    _population_kernel = None
+
+    # Losses written in terms of RED² receive it directly and skip the sqrt
+    _uses_red_squared = False
+
+    def _scalar_kernel_args(self):
+        return ()
+
+    def _kernel_labels(self):
+        return self._y_class if self._kernel_uses_class_codes else self._y_f64
+
+    def _scalar_base_loss(self, HSP):
+        """Evaluate a single candidate through the same per-sample kernel as the batch path"""
+        D, P, H, R = HSP
+
+        if NUMBA_AVAILABLE and self._scalar_kernel is not None:
+            return self._scalar_kernel(
+                float(D), float(P), float(H), float(R),
+                self._Xd, self._Xp, self._Xh, self._kernel_labels(),
+                *self._scalar_kernel_args()
+            )
+
+        # Run the candidate as a population of one so the NumPy fallback also
+        # reads the cached contiguous columns instead of strided slices of X
+        red, _ = self._batch_red(np.array([[D], [P], [H], [R]], dtype=np.float64))
+
+        return np.mean(self._batch_loss_per_sample(red), dtype=np.float64)
+
+    def _batch_red(self, HSP):
+        """
+        RED of every sample for a whole population of candidates
+
+        Args:
+            HSP: Array of shape (4, S) as passed by a vectorized differential_evolution
+
+        Returns:
+            Tuple of (red with shape (n_samples, S), R with shape (S,)).
+            red holds RED² instead when the loss sets _uses_red_squared.
+        """
+        # Candidates are cast to float32 so the RED buffers match the float32
+        # columns, halving the memory traffic of every loss kernel
+        HSP = np.asarray(HSP, dtype=np.float32)
+        R = HSP[3]
+        centers = HSP[:3] - self._X_offset[:, None]
+        # d² = |x|² - 2 x·c + |c|² with one GEMM and a single (n_samples, S) buffer
+        red = self._X_shifted @ centers
+        red *= -2.0
+        red += self._x_sq_col
+        red += np.einsum('ij,ij->j', centers, centers)
+        # Rounding can leave tiny negatives for samples at the center
+        np.maximum(red, 0.0, out=red)
+        red /= R * R
+        if not self._uses_red_squared:
+            np.sqrt(red, out=red)
+        return red, R
+
+    def _batch_base_loss(self, HSP):
+        """Evaluate all candidates at once, returning base losses of shape (S,)"""
+        if NUMBA_AVAILABLE and self._population_kernel is not None:
+            # Fused per-candidate passes spread over the cores, no (n_samples, S) buffers
+            return self._population_kernel(
+                np.ascontiguousarray(HSP, dtype=np.float64),
+                self._Xd, self._Xp, self._Xh, self._kernel_labels(),
+                *self._scalar_kernel_args()
+            )
+
+        # Split large populations so each (n_samples, chunk) RED buffer stays cache sized
+        chunk = max(1, BATCH_CHUNK_ELEMENTS // len(self._Xd))
+        if HSP.shape[1] > chunk:
+            return np.concatenate([
+                self._batch_base_loss(HSP[:, start:start + chunk])
+                for start in range(0, HSP.shape[1], chunk)
+            ])
+
+        red, _ = self._batch_red(HSP)
+        # Accumulate the mean in float64 so candidates stay comparable
+        return np.mean(self._batch_loss_per_sample(red), axis=0, dtype=np.float64)
+
+    def _batch_loss_per_sample(self, red):
+        """Per-sample loss for a (n_samples, S) RED matrix (may overwrite red)"""
+        raise NotImplementedError
+
+
+class BoundaryDistanceLoss(BaseTheoryLoss):
     """
     Pure boundary distance loss - NO arbitrary parameters
 
@@ -28,37 +403,21 @@ class BoundaryDistanceLoss:
     This is pure L1 distance to the theoretically correct region.
     """
 
-    def __init__(self, size_factor=None):
-        self.size_factor = size_factor
-
-    def __call__(self, HSP, X, y):
-        D, P, H, R = HSP
-        center = np.array([D, P, H])
-
-        dist = hansen_distance(X, center)
-        red = dist / R
+    _scalar_kernel = staticmethod(_boundary_distance_kernel)
+    _population_kernel = staticmethod(_boundary_distance_population)
+    _kernel_uses_class_codes = True
 
-        # Distance from theoretically correct position
-        loss_per_sample = np.zeros(len(y))
+    def _batch_loss_per_sample(self, red):
+        # Every branch is |RED - 1| unless the sample is already on its correct
+        # side (good inside, poor outside), so work on one signed buffer in place
+        red -= 1.0
+        satisfied = np.where(self._good_col, red < 0, self._poor_col & (red > 0))
+        np.abs(red, out=red)
+        np.putmask(red, satisfied, 0.0)
+        return red
 
-        for i in range(len(y)):
-            if y[i] == 1.0:  # Good: should be inside (RED < 1)
-                loss_per_sample[i] = np.maximum(0, red[i] - 1)
-            elif y[i] == 0.0:  # Poor: should be outside (RED > 1)
-                loss_per_sample[i] = np.maximum(0, 1 - red[i])
-            else:  # Partial (0.5): should be on boundary (RED = 1)
-                loss_per_sample[i] = np.abs(red[i] - 1)
-
-        base_loss = np.mean(loss_per_sample)
-
-        if self.size_factor is not None and self.size_factor > 0:
-            size_penalty = self.size_factor * (R ** 2)
-            return base_loss + size_penalty
 
-        return base_loss
-
-
-class ProportionalBoundaryLoss:
+class ProportionalBoundaryLoss(BaseTheoryLoss):
     """
     Proportional boundary loss - NO arbitrary parameters
 
@@ -78,33 +437,22 @@ class ProportionalBoundaryLoss:
     Can handle ANY y value (not just 0.0, 0.5, 1.0) continuously.
     """
 
-    def __init__(self, size_factor=None):
-        self.size_factor = size_factor
+    _scalar_kernel = staticmethod(_proportional_boundary_kernel)
+    _population_kernel = staticmethod(_proportional_boundary_population)
 
-    def __call__(self, HSP, X, y):
-        D, P, H, R = HSP
-        center = np.array([D, P, H])
-
-        dist = hansen_distance(X, center)
-        red = dist / R
-
-        # Boundary violations
-        penalty_outside = np.maximum(0, red - 1)  # RED > 1
-        penalty_inside = np.maximum(0, 1 - red)   # RED < 1
+    def _batch_loss_per_sample(self, red):
+        # Reuse red as the outside penalty buffer; one extra buffer for inside
+        red -= 1.0
+        penalty_inside = np.negative(red)
+        np.maximum(red, 0, out=red)
+        red *= self._y_col
+        np.maximum(penalty_inside, 0, out=penalty_inside)
+        penalty_inside *= self._one_minus_y_col
+        red += penalty_inside
+        return red
 
-        # Weight by solubility score (no arbitrary parameters)
-        loss_per_sample = y * penalty_outside + (1 - y) * penalty_inside
 
-        base_loss = np.mean(loss_per_sample)
-
-        if self.size_factor is not None and self.size_factor > 0:
-            size_penalty = self.size_factor * (R ** 2)
-            return base_loss + size_penalty
-
-        return base_loss
-
-
-class LogBarrierLoss:
+class LogBarrierLoss(BaseTheoryLoss):
     """
     Logarithmic barrier loss - NO arbitrary parameters
 
@@ -121,46 +469,35 @@ class LogBarrierLoss:
     """
 
     def __init__(self, size_factor=None, epsilon=1e-6):
-        self.size_factor = size_factor
+        super().__init__(size_factor)
         self.epsilon = epsilon  # Technical parameter to avoid log(0), not arbitrary
 
-    def __call__(self, HSP, X, y):
-        D, P, H, R = HSP
-        center = np.array([D, P, H])
-
-        dist = hansen_distance(X, center)
-        red = dist / R
-
-        loss_per_sample = np.zeros(len(y))
-
-        for i in range(len(y)):
-            if y[i] == 1.0:  # Good: enforce RED < 1
-                if red[i] < 1 - self.epsilon:
-                    loss_per_sample[i] = -np.log(1 - red[i] + self.epsilon)
-                else:
-                    # Heavy penalty if constraint violated
-                    loss_per_sample[i] = 10.0 * (red[i] - 1 + self.epsilon)
-
-            elif y[i] == 0.0:  # Poor: enforce RED > 1
-                if red[i] > 1 + self.epsilon:
-                    loss_per_sample[i] = -np.log(red[i] - 1 + self.epsilon)
-                else:
-                    # Heavy penalty if constraint violated
-                    loss_per_sample[i] = 10.0 * (1 + self.epsilon - red[i])
-
-            else:  # Partial: minimize distance from boundary
-                loss_per_sample[i] = np.abs(red[i] - 1)
-
-        base_loss = np.mean(loss_per_sample)
-
-        if self.size_factor is not None and self.size_factor > 0:
-            size_penalty = self.size_factor * (R ** 2)
-            return base_loss + size_penalty
-
-        return base_loss
+    _scalar_kernel = staticmethod(_log_barrier_kernel)
+    _population_kernel = staticmethod(_log_barrier_population)
+    _kernel_uses_class_codes = True
+
+    def _scalar_kernel_args(self):
+        return (float(self.epsilon),)
+
+    def _batch_loss_per_sample(self, red):
+        eps = self.epsilon
+        # Good and poor barriers are mirror images: with the signed margin
+        # m = 1 - RED (good) or RED - 1 (poor) both are -log(m + eps) inside the
+        # feasible side and 10 * (eps - m) otherwise, so one log pass covers both
+        red -= 1.0
+        partial = np.abs(red) if self._has_partial else None
+        margin = np.negative(red, out=red, where=self._good_col)
+        loss = np.where(
+            margin > eps,
+            -np.log(np.maximum(margin, eps) + eps),  # floored so the unused branch stays finite
+            10.0 * (eps - margin)
+        )
+        if partial is None:
+            return loss
+        return np.where(self._good_col | self._poor_col, loss, partial)
 
 
-class NormalizedDistanceLoss:
+class NormalizedDistanceLoss(BaseTheoryLoss):
     """
     Normalized distance loss - NO arbitrary parameters
 
@@ -178,36 +515,21 @@ class NormalizedDistanceLoss:
     Pure mathematical form using only the natural RED metric.
     """
 
-    def __init__(self, size_factor=None):
-        self.size_factor = size_factor
-
-    def __call__(self, HSP, X, y):
-        D, P, H, R = HSP
-        center = np.array([D, P, H])
-
-        dist = hansen_distance(X, center)
-        red = dist / R
-
-        loss_per_sample = np.zeros(len(y))
-
-        for i in range(len(y)):
-            if y[i] == 1.0:  # Good: minimize RED
-                loss_per_sample[i] = red[i]
-            elif y[i] == 0.0:  # Poor: maximize RED (minimize 1/RED)
-                loss_per_sample[i] = 1.0 / (red[i] + 1e-6)
-            else:  # Partial: RED should be 1
-                loss_per_sample[i] = np.abs(red[i] - 1)
-
-        base_loss = np.mean(loss_per_sample)
-
-        if self.size_factor is not None and self.size_factor > 0:
-            size_penalty = self.size_factor * (R ** 2)
-            return base_loss + size_penalty
-
-        return base_loss
+    _scalar_kernel = staticmethod(_normalized_distance_kernel)
+    _population_kernel = staticmethod(_normalized_distance_population)
+    _kernel_uses_class_codes = True
+
+    def _batch_loss_per_sample(self, red):
+        poor = 1.0 / (red + 1e-6)
+        if not self._has_partial:
+            return np.where(self._good_col, red, poor)
+        return np.where(
+            self._good_col, red,
+            np.where(self._poor_col, poor, np.abs(red - 1))
+        )
 
 
-class CrossEntropyStyleLoss:
+class CrossEntropyStyleLoss(BaseTheoryLoss):
     """
     Cross-entropy inspired loss - NO arbitrary parameters
 
@@ -227,34 +549,25 @@ class CrossEntropyStyleLoss:
     Can handle ANY y value (not just 0.0, 0.5, 1.0) continuously.
     """
 
-    def __init__(self, size_factor=None):
-        self.size_factor = size_factor
-
-    def __call__(self, HSP, X, y):
-        D, P, H, R = HSP
-        center = np.array([D, P, H])
-
-        dist = hansen_distance(X, center)
-        red = dist / R
-
-        # Map RED to probability of being soluble
-        # p(soluble) = 1 / (1 + RED²)
-        p_soluble = 1.0 / (1.0 + red**2)
-
-        # Clip to avoid log(0)
-        epsilon = 1e-7
-        p_soluble = np.clip(p_soluble, epsilon, 1 - epsilon)
-
-        # Cross-entropy loss
-        loss_per_sample = -(y * np.log(p_soluble) + (1 - y) * np.log(1 - p_soluble))
-
-        base_loss = np.mean(loss_per_sample)
-
-        if self.size_factor is not None and self.size_factor > 0:
-            size_penalty = self.size_factor * (R ** 2)
-            return base_loss + size_penalty
-
-        return base_loss
+    _scalar_kernel = staticmethod(_cross_entropy_kernel)
+    _population_kernel = staticmethod(_cross_entropy_population)
+    _uses_red_squared = True
+
+    def _batch_loss_per_sample(self, red2):
+        # p(soluble) = 1 / (1 + RED²), computed in place in the RED² buffer
+        p_soluble = red2
+        p_soluble += 1.0
+        np.reciprocal(p_soluble, out=p_soluble)
+        np.clip(p_soluble, 1e-7, 1 - 1e-7, out=p_soluble)
+
+        log_insoluble = np.subtract(1.0, p_soluble)
+        np.log(log_insoluble, out=log_insoluble)
+        log_insoluble *= self._one_minus_y_col
+        np.log(p_soluble, out=p_soluble)
+        p_soluble *= self._y_col
+        p_soluble += log_insoluble
+        np.negative(p_soluble, out=p_soluble)
+        return p_soluble
 
 
 # Available loss functions
@@ -4,6 +4,8 @@ Generates Plotly-compatible 3D sphere data for Hansen Solubility Parameters
 """
 
 import logging
+from functools import lru_cache
+
 import numpy as np
 import plotly.graph_objects as go
 from typing import Dict, List, Optional, Tuple
@@ -11,6 +13,59 @@ from ..models.hsp_models import HSPCalculationResult
 
 logger = logging.getLogger(__name__)
 
+# Decimal places kept for sphere geometry sent to the browser (HSP values are
+# only meaningful to ~0.01 MPa^0.5, full float repr triples the JSON size)
+COORDINATE_DECIMALS = 3
+
+# Wireframe layout: latitude circles, longitude lines and points per line
+WIREFRAME_LATITUDES = 12
+WIREFRAME_LONGITUDES = 12
+WIREFRAME_POINTS = 50
+
+
+@lru_cache(maxsize=None)
+def _unit_sphere(resolution: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unit sphere surface grid; the topology is fixed, so it is built once per resolution"""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    u, v = np.meshgrid(u, v)
+    return np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), np.cos(v)
+
+
+@lru_cache(maxsize=None)
+def _unit_wireframe() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Unit sphere wireframe as (n_lines, WIREFRAME_POINTS + 1) arrays
+
+    Rows are the latitude circles followed by the longitude lines.
+    """
+    t = np.arange(WIREFRAME_POINTS + 1) / WIREFRAME_POINTS
+
+    # Latitude circles (horizontal slices): phi fixed per row, theta 0 to 2π
+    phi = (np.pi * np.arange(WIREFRAME_LATITUDES) / (WIREFRAME_LATITUDES - 1))[:, None]
+    theta = 2 * np.pi * t[None, :]
+    lat = (
+        np.cos(theta) * np.sin(phi),
+        np.sin(theta) * np.sin(phi),
+        np.broadcast_to(np.cos(phi), (WIREFRAME_LATITUDES, t.size))
+    )
+
+    # Longitude lines (vertical slices): theta fixed per row, phi 0 to π
+    theta = (2 * np.pi * np.arange(WIREFRAME_LONGITUDES) / WIREFRAME_LONGITUDES)[:, None]
+    phi = np.pi * t[None, :]
+    lon = (
+        np.cos(theta) * np.sin(phi),
+        np.sin(theta) * np.sin(phi),
+        np.broadcast_to(np.cos(phi), (WIREFRAME_LONGITUDES, t.size))
+    )
+
+    return tuple(np.vstack((a, b)) for a, b in zip(lat, lon))
+
+
+def _polylines(rows: np.ndarray) -> List[Optional[float]]:
+    """Flatten wireframe rows into one Plotly line list with None as line breaks"""
+    return [value for row in np.round(rows, COORDINATE_DECIMALS).tolist() for value in row + [None]]
+
 
 class HansenSphereVisualizationService:
     """Service for generating Hansen sphere 3D visualizations using Plotly"""
@@ -39,16 +94,14 @@ class HansenSphereVisualizationService:
         Returns:
             Dictionary with x, y, z coordinates for ellipsoid surface
         """
-        # Generate sphere surface using parametric equations
-        u = np.linspace(0, 2 * np.pi, resolution)
-        v = np.linspace(0, np.pi, resolution)
-        u, v = np.meshgrid(u, v)
+        # Scale the cached unit sphere surface (parametric equations)
+        unit_x, unit_y, unit_z = _unit_sphere(resolution)
 
         # Parametric equations for Hansen spheroid (ellipsoid in Euclidean space)
         # δD direction has HALF the radius due to factor of 4 in distance formula
-        x = center[0] + (radius / 2) * np.cos(u) * np.sin(v)  # δD: half radius
-        y = center[1] + radius * np.sin(u) * np.sin(v)        # δP: full radius
-        z = center[2] + radius * np.cos(v)                     # δH: full radius
+        x = center[0] + (radius / 2) * unit_x  # δD: half radius
+        y = center[1] + radius * unit_y        # δP: full radius
+        z = center[2] + radius * unit_z        # δH: full radius
 
         # Clip to 0 (Hansen parameters cannot be negative)
         x = np.maximum(x, 0)
@@ -56,9 +109,9 @@ class HansenSphereVisualizationService:
         z = np.maximum(z, 0)
 
         return {
-            'x': x.tolist(),
-            'y': y.tolist(),
-            'z': z.tolist()
+            'x': np.round(x, COORDINATE_DECIMALS).tolist(),
+            'y': np.round(y, COORDINATE_DECIMALS).tolist(),
+            'z': np.round(z, COORDINATE_DECIMALS).tolist()
         }
 
     @staticmethod
@@ -170,17 +223,8 @@ class HansenSphereVisualizationService:
         logger.info(f"generate_plotly_visualization called with {len(solvent_data)} solvents")
         logger.debug(f"Input solvent_data: {solvent_data}")
 
-        # Generate sphere data - cube mode will handle equal ranges automatically
-        sphere_center = (hsp_result.delta_d, hsp_result.delta_p, hsp_result.delta_h)
         radius = hsp_result.radius
 
-        # Generate sphere coordinates using original center and radius
-        sphere_coords = cls.generate_sphere_coordinates(
-            center=sphere_center,
-            radius=radius,
-            resolution=25
-        )
-
         # Create solvent scatter points using original data
         solvent_points = cls.create_solvent_points(solvent_data)
 
@@ -192,23 +236,7 @@ class HansenSphereVisualizationService:
         fixed_y_range = [0, 50]   # δP
         fixed_z_range = [0, 50]   # δH
 
-        # Check for out-of-range data and log warnings
-        all_x = []
-        for row in sphere_coords['x']:
-            all_x.extend(row if isinstance(row, list) else [row])
-        all_x.extend(solvent_points['x'])
-
-        all_y = []
-        for row in sphere_coords['y']:
-            all_y.extend(row if isinstance(row, list) else [row])
-        all_y.extend(solvent_points['y'])
-
-        all_z = []
-        for row in sphere_coords['z']:
-            all_z.extend(row if isinstance(row, list) else [row])
-        all_z.extend(solvent_points['z'])
-
-        # Identify out-of-range solvents
+        # Identify out-of-range solvents and log warnings
         out_of_range_solvents = []
         for i, solvent in enumerate(solvent_data):
             delta_d = solvent.get('delta_d', 0)
@@ -226,58 +254,16 @@ class HansenSphereVisualizationService:
         traces = []
 
         # Hansen sphere as wireframe (lines) to allow hovering points inside
-        # Draw multiple circular cross-sections of the ellipsoid
-        sphere_lines_x = []
-        sphere_lines_y = []
-        sphere_lines_z = []
-
-        # Extract center and radius
+        # Draw circular cross-sections of the ellipsoid by scaling the cached
+        # unit wireframe (latitude circles and longitude lines)
         center_d, center_p, center_h = hsp_result.delta_d, hsp_result.delta_p, hsp_result.delta_h
         r = radius
+        unit_x, unit_y, unit_z = _unit_wireframe()
 
-        # Number of latitude and longitude lines
-        n_lat = 12  # latitude circles
-        n_lon = 12  # longitude lines
-        n_points = 50  # points per circle
-
-        import numpy as np
-
-        # Latitude circles (horizontal slices)
-        for i in range(n_lat):
-            phi = np.pi * i / (n_lat - 1)  # 0 to π
-            circle_x = []
-            circle_y = []
-            circle_z = []
-            for j in range(n_points + 1):
-                theta = 2 * np.pi * j / n_points
-                # Ellipsoid: δD has half radius
-                x = center_d + (r / 2) * np.cos(theta) * np.sin(phi)
-                y = center_p + r * np.sin(theta) * np.sin(phi)
-                z = center_h + r * np.cos(phi)
-                circle_x.append(x)
-                circle_y.append(y)
-                circle_z.append(z)
-            sphere_lines_x.extend(circle_x + [None])  # None creates line break
-            sphere_lines_y.extend(circle_y + [None])
-            sphere_lines_z.extend(circle_z + [None])
-
-        # Longitude lines (vertical slices)
-        for i in range(n_lon):
-            theta = 2 * np.pi * i / n_lon
-            line_x = []
-            line_y = []
-            line_z = []
-            for j in range(n_points + 1):
-                phi = np.pi * j / n_points  # 0 to π
-                x = center_d + (r / 2) * np.cos(theta) * np.sin(phi)
-                y = center_p + r * np.sin(theta) * np.sin(phi)
-                z = center_h + r * np.cos(phi)
-                line_x.append(x)
-                line_y.append(y)
-                line_z.append(z)
-            sphere_lines_x.extend(line_x + [None])
-            sphere_lines_y.extend(line_y + [None])
-            sphere_lines_z.extend(line_z + [None])
+        # Ellipsoid: δD has half radius
+        sphere_lines_x = _polylines(center_d + (r / 2) * unit_x)
+        sphere_lines_y = _polylines(center_p + r * unit_y)
+        sphere_lines_z = _polylines(center_h + r * unit_z)
 
         traces.append({
             'type': 'scatter3d',
@@ -0,0 +1,19 @@
+"""
+Hansen distance shared by the API, models and services
+"""
+
+import numpy as np
+
+
+def hansen_distance(delta_d1, delta_p1, delta_h1, delta_d2, delta_p2, delta_h2):
+    """
+    Calculate Hansen distance (Ra) between two points in HSP space
+
+    Ra = √[4(ΔδD)² + (ΔδP)² + (ΔδH)²]
+
+    Accepts scalars as well as NumPy arrays or pandas Series (element-wise).
+    """
+    diff_d = delta_d1 - delta_d2
+    diff_p = delta_p1 - delta_p2
+    diff_h = delta_h1 - delta_h2
+    return np.sqrt(4 * diff_d * diff_d + diff_p * diff_p + diff_h * diff_h)
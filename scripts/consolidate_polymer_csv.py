@@ -4,55 +4,132 @@ CSV Consolidation Script for Polymer Database
 Consolidates multiple CSV files with data richness priority handling for duplicates.
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
+import csv
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum number of CSV files read concurrently
+MAX_LOAD_WORKERS = 8
+
+# Use the multi-threaded PyArrow CSV reader/writer when available (pandas C parser otherwise)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CSV_ENGINE = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+
+# Cell values treated as missing in numeric columns
+MISSING_VALUE_MARKERS = frozenset(['-', '–', '—', '', 'nan', 'NaN', 'NA', 'N/A'])
+
+# Numeric fields to clean: field -> (type, allow negative)
+NUMERIC_FIELDS = {
+    'delta_D': ('float', False),
+    'delta_P': ('float', False),
+    'delta_H': ('float', False),
+    'delta_total': ('float', False),
+    'Ra': ('float', False),
+    'gamma_s(Polar)': ('float', True),
+    'gamma_sd': ('float', True),
+    'gamma_sP': ('float', True),
+    'gamma_s(Acid-Base)': ('float', True),
+    'gamma_sLW': ('float', True),
+    'gamma_sAB': ('float', True),
+    'gamma_s-': ('float', True),
+    'gamma_s+': ('float', True),
+}
+
 
 class PolymerCSVConsolidator:
     """Consolidates multiple polymer CSV files with intelligent duplicate handling"""
 
+    # Column mapping for different files
+    COLUMN_MAPPING = {
+        'delta': 'delta_total',
+        'delta_D': 'delta_D',
+        'delta_P': 'delta_P',
+        'delta_H': 'delta_H',
+        'R0': 'Ra',
+        'Resin': 'Polymer',
+        'Sample': 'Polymer',  # PVB.csv uses 'Sample'
+        'dD': 'delta_D',      # PVB.csv uses 'dD'
+        'dP': 'delta_P',      # PVB.csv uses 'dP'
+        'dH': 'delta_H',      # PVB.csv uses 'dH'
+    }
+
+    # File priority weights (higher = better)
+    FILE_WEIGHTS = {
+        'polytable': 3000,  # Main polymer database
+    }
+    DEFAULT_FILE_WEIGHT = 1000
+
     def __init__(self, input_dir: str, output_file: str):
         self.input_dir = Path(input_dir)
         self.output_file = Path(output_file)
         self.consolidated_data = []
         self.duplicate_stats = {}
 
+    def load_csv_file(self, csv_file: Path) -> Optional[pd.DataFrame]:
+        """Load a single CSV file, returning None on error"""
+        try:
+            try:
+                df = pd.read_csv(csv_file, encoding='utf-8-sig', engine=CSV_ENGINE)
+            except ValueError as e:
+                if CSV_ENGINE == 'c':
+                    raise
+                logger.debug("PyArrow engine failed for %s (%s), using C engine", csv_file.name, e)
+                df = pd.read_csv(csv_file, encoding='utf-8-sig', engine='c')
+            logger.info(f"Loaded {csv_file.name}: {len(df)} rows, {len(df.columns)} columns")
+            return df
+        except Exception as e:
+            logger.error(f"Error loading {csv_file.name}: {e}")
+            return None
+
     def load_csv_files(self) -> Dict[str, pd.DataFrame]:
         """Load all CSV files from input directory"""
-        csv_files = {}
-
-        for csv_file in self.input_dir.glob("*.csv"):
-            # Skip list.csv (URL mapping file)
-            if csv_file.name == 'list.csv':
-                continue
-
-            try:
-                df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                csv_files[csv_file.stem] = df
-                logger.info(f"Loaded {csv_file.name}: {len(df)} rows, {len(df.columns)} columns")
-            except Exception as e:
-                logger.error(f"Error loading {csv_file.name}: {e}")
+        csv_paths = [
+            csv_file for csv_file in self.input_dir.glob("*.csv")
+            if csv_file.name != 'list.csv'  # Skip list.csv (URL mapping file)
+        ]
+        if not csv_paths:
+            return {}
 
-        return csv_files
+        # read_csv releases the GIL while parsing, so files are read concurrently;
+        # map() keeps the glob order, which decides ties in duplicate resolution
+        # Parsing is CPU-bound, so more threads than cores do not help
+        max_workers = min(MAX_LOAD_WORKERS, len(csv_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataframes = list(executor.map(self.load_csv_file, csv_paths))
+
+        return {
+            csv_file.stem: df
+            for csv_file, df in zip(csv_paths, dataframes)
+            if df is not None
+        }
 
     def load_source_urls(self, url_file: Path) -> Dict[str, str]:
         """Load source URLs from list.csv"""
         try:
-            url_df = pd.read_csv(url_file)
-
-            # Create mapping from file name (without extension) to URL
-            url_mapping = {}
-            for _, row in url_df.iterrows():
-                file_name = Path(row['file']).stem  # Remove .csv extension
-                url_mapping[file_name] = row['URL']
+            # Small two-column file: read with the csv module, no DataFrame needed
+            with open(url_file, newline='', encoding='utf-8-sig') as f:
+                # Create mapping from file name (without extension) to URL
+                url_mapping = {
+                    row['file'].rsplit('.', 1)[0]: row['URL'] or None  # Remove .csv extension
+                    for row in csv.DictReader(f)
+                    if row.get('file')
+                }
 
             logger.info(f"Loaded {len(url_mapping)} source URL mappings")
             return url_mapping
@@ -61,83 +138,66 @@ class PolymerCSVConsolidator:
             logger.error(f"Error loading URL mapping file: {e}")
             return {}
 
-    def clean_numeric_field(self, value, field_type='float', allow_negative=True):
-        """Clean numeric field values"""
+    def clean_numeric_columns(self, df: pd.DataFrame, file_name: str) -> pd.DataFrame:
+        """Clean numeric columns in place, one vectorized pass per column"""
+        for field, (field_type, allow_negative) in NUMERIC_FIELDS.items():
+            if field not in df.columns:
+                continue
 
-        # Check for None/NaN/empty
-        if pd.isna(value):
-            return None
+            if pd.api.types.is_numeric_dtype(df[field]):
+                # Already parsed as numbers by read_csv (no copy for float64 columns)
+                result = df[field].astype(float, copy=False)
+            else:
+                # Treat missing value markers as NaN
+                values = df[field].astype('string').str.strip()
+                values = values.mask(values.isin(MISSING_VALUE_MARKERS))
+
+                # Convert to numeric
+                result = pd.to_numeric(values, errors='coerce').astype(float)
+                unconvertible = result.isna() & values.notna()
+                if unconvertible.any():
+                    logger.warning(f"Cannot convert to {field_type} in {file_name}.{field}: "
+                                   f"{values[unconvertible].tolist()}")
 
-        # Handle string values
-        if isinstance(value, str):
-            value = value.strip()
+            if field_type == 'int':
+                result = np.trunc(result)
+            if not allow_negative:
+                negative = result < 0
+                if negative.any():
+                    result = result.mask(negative)
 
-            # Check for missing value markers
-            if value in ['-', '–', '—', '', 'nan', 'NaN', 'NA', 'N/A']:
-                return None
+            df[field] = result.astype('Int64') if field_type == 'int' else result
 
-        # Convert to numeric
-        try:
-            if field_type == 'int':
-                result = int(float(value))
-                if not allow_negative and result < 0:
-                    return None
-                return result
-            else:  # float
-                result = float(value)
-                if not allow_negative and result < 0:
-                    return None
-                return result
-        except (ValueError, TypeError):
-            logger.warning(f"Cannot convert to {field_type}: {value}")
-            return None
+        return df
 
     def normalize_column_names(self, df: pd.DataFrame, file_name: str) -> pd.DataFrame:
         """Normalize column names to standard format"""
-        df = df.copy()
-
-        # Column mapping for different files
-        column_mapping = {
-            'delta': 'delta_total',
-            'delta_D': 'delta_D',
-            'delta_P': 'delta_P',
-            'delta_H': 'delta_H',
-            'R0': 'Ra',
-            'Resin': 'Polymer',
-            'Sample': 'Polymer',  # PVB.csv uses 'Sample'
-            'dD': 'delta_D',      # PVB.csv uses 'dD'
-            'dP': 'delta_P',      # PVB.csv uses 'dP'
-            'dH': 'delta_H',      # PVB.csv uses 'dH'
-        }
 
-        # Apply mappings
-        df.columns = [column_mapping.get(col, col) for col in df.columns]
+        # Apply mappings (renaming only the column index, without copying the data)
+        df = df.rename(columns=self.COLUMN_MAPPING, copy=False)
 
         # Ensure essential columns exist
         essential_columns = ['Polymer', 'delta_D', 'delta_P', 'delta_H']
-        for col in essential_columns:
-            if col not in df.columns:
-                logger.warning(f"Missing essential column '{col}' in {file_name}")
+        missing = [col for col in essential_columns if col not in df.columns]
+        if missing:
+            logger.warning("Missing essential columns %s in %s", missing, file_name)
 
         return df
 
-    def calculate_priority_score(self, file_name: str, row_index: int,
-                               total_rows: int, completeness_ratio: float) -> int:
-        """Calculate priority score for duplicate resolution"""
-
-        # File priority weights (higher = better)
-        file_weights = {
-            'polytable': 3000,  # Main polymer database
-        }
+    def calculate_priority_scores(self, df: pd.DataFrame, file_name: str,
+                                  completeness: pd.Series) -> pd.Series:
+        """Calculate priority scores for duplicate resolution for all rows of a file"""
 
         # Get base file weight
-        base_weight = file_weights.get(file_name, 1000)
+        base_weight = self.FILE_WEIGHTS.get(file_name, self.DEFAULT_FILE_WEIGHT)
+
+        total_rows = len(df)
 
         # Row position bonus (earlier rows get higher priority)
-        position_bonus = total_rows - row_index
+        position_bonus = pd.Series(total_rows - np.arange(total_rows), index=df.index)
 
         # Data completeness bonus
-        completeness_bonus = int(completeness_ratio * 100)
+        completeness_bonus = (completeness * 100).astype(int)
 
         # File size bonus (more data = higher priority)
         size_bonus = total_rows * 10
@@ -146,39 +206,68 @@ class PolymerCSVConsolidator:
 
         return total_score
 
-    def calculate_completeness(self, row: pd.Series, essential_cols: List[str]) -> float:
-        """Calculate data completeness ratio for a row"""
+    def calculate_completeness(self, df: pd.DataFrame, essential_cols: List[str]) -> pd.Series:
+        """Calculate data completeness ratio for all rows of a file"""
         if not essential_cols:
-            return 1.0
+            return pd.Series(1.0, index=df.index)
+
+        # Columns absent from the file count as missing for every row
+        present_cols = [col for col in essential_cols if col in df.columns]
+        non_null_count = np.zeros(len(df), dtype=np.int64)
+        for col in present_cols:
+            non_null_count += df[col].notna().to_numpy()
+        return pd.Series(non_null_count / len(essential_cols), index=df.index)
+
+    def resolve_duplicates(self, all_rows: pd.DataFrame, keys: pd.Series) -> pd.Index:
+        """
+        Keep the highest priority row for each polymer name
+
+        Args:
+            all_rows: Cleaned rows of all files in processing order
+            keys: Normalized polymer name of each row
+
+        Returns:
+            Index of one row per polymer, in order of first occurrence; ties keep the earliest row
+        """
+        scores = all_rows['priority_score']
+
+        # idxmax keeps the earliest row among equal scores; sort=False lists the keys
+        # in order of first occurrence
+        best_index = pd.Index(scores.groupby(keys, sort=False).idxmax().to_numpy())
+
+        # Update duplicate stats: every later occurrence either replaced the best so far or was rejected
+        # Only rows whose key occurs more than once need the running best score
+        repeated = keys.duplicated(keep=False)
+        repeated_keys = keys[repeated]
+        best_so_far = scores[repeated].groupby(repeated_keys).cummax().groupby(repeated_keys).shift().dropna()
+        duplicate_keys = keys[best_so_far.index]
+        for polymer_name, count in duplicate_keys.groupby(duplicate_keys, sort=False).size().items():
+            self.duplicate_stats.setdefault(polymer_name, {'count': 0})['count'] += count
+
+        # Per-duplicate sources are only consumed by debug logging
+        if logger.isEnabledFor(logging.DEBUG):
+            for polymer_name, file_name, source_row, priority_score, previous_best in zip(
+                    duplicate_keys, all_rows['source_file'][best_so_far.index],
+                    all_rows['source_row'][best_so_far.index], scores[best_so_far.index], best_so_far):
+                rejected = priority_score <= previous_best
+                if rejected:
+                    logger.debug("Duplicate found for %s, keeping existing (higher priority)", polymer_name)
+                else:
+                    logger.debug("Replacing %s: %d -> %d", polymer_name, previous_best, priority_score)
+                self.duplicate_stats[polymer_name].setdefault('sources', []).append(
+                    (file_name, source_row, priority_score, rejected)
+                )
 
-        non_null_count = sum(1 for col in essential_cols if col in row.index and pd.notna(row[col]))
-        return non_null_count / len(essential_cols)
+        return best_index
 
     def consolidate_files(self, csv_files: Dict[str, pd.DataFrame], source_urls: Dict[str, str] = None) -> pd.DataFrame:
         """Consolidate all CSV files with duplicate handling"""
 
-        all_data = []
-        polymer_registry = {}  # Track polymers and their priority scores
+        frames = []  # Cleaned rows of each file
+        key_frames = []  # Normalized polymer names of each file
 
         essential_cols = ['delta_D', 'delta_P', 'delta_H']
 
-        # Define numeric fields to clean
-        numeric_fields = {
-            'delta_D': ('float', False),
-            'delta_P': ('float', False),
-            'delta_H': ('float', False),
-            'delta_total': ('float', False),
-            'Ra': ('float', False),
-            'gamma_s(Polar)': ('float', True),
-            'gamma_sd': ('float', True),
-            'gamma_sP': ('float', True),
-            'gamma_s(Acid-Base)': ('float', True),
-            'gamma_sLW': ('float', True),
-            'gamma_sAB': ('float', True),
-            'gamma_s-': ('float', True),
-            'gamma_s+': ('float', True),
-        }
-
         # Process each file
         for file_name, df in csv_files.items():
             logger.info(f"Processing {file_name}...")
@@ -191,93 +280,65 @@ class PolymerCSVConsolidator:
                 logger.warning(f"No 'Polymer' column found in {file_name}, skipping...")
                 continue
 
-            total_rows = len(df)
-
-            # Process each row
-            for idx, row in df.iterrows():
-                polymer_name = str(row['Polymer']).strip()
-
-                # Skip empty polymer names
-                if not polymer_name or polymer_name.lower() in ['nan', '']:
-                    continue
-
-                # Calculate completeness and priority
-                completeness = self.calculate_completeness(row, essential_cols)
-                priority_score = self.calculate_priority_score(
-                    file_name, idx, total_rows, completeness
-                )
-
-                # Add source information
-                row_dict = row.to_dict()
-
-                # Clean numeric fields
-                for field, (dtype, allow_neg) in numeric_fields.items():
-                    if field in row_dict:
-                        row_dict[field] = self.clean_numeric_field(
-                            row_dict[field],
-                            field_type=dtype,
-                            allow_negative=allow_neg
-                        )
-
-                row_dict['source_file'] = file_name
-                row_dict['source_row'] = idx + 2  # +2 for header and 0-based index
-                row_dict['priority_score'] = priority_score
-                row_dict['completeness'] = completeness
-
-                # Add source URL if available
-                if source_urls and file_name in source_urls:
-                    row_dict['source_url'] = source_urls[file_name]
-                else:
-                    row_dict['source_url'] = None
-
-                # Handle duplicates
-                if polymer_name in polymer_registry:
-                    existing_score = polymer_registry[polymer_name]['priority_score']
-
-                    if priority_score > existing_score:
-                        # Replace with higher priority data
-                        logger.debug(f"Replacing {polymer_name}: {existing_score} -> {priority_score}")
-                        polymer_registry[polymer_name] = row_dict
-
-                        # Update duplicate stats
-                        if polymer_name not in self.duplicate_stats:
-                            self.duplicate_stats[polymer_name] = {'count': 0, 'sources': []}
-                        self.duplicate_stats[polymer_name]['count'] += 1
-                        self.duplicate_stats[polymer_name]['sources'].append(
-                            f"{file_name}:{idx+2} (score: {priority_score})"
-                        )
-                    else:
-                        # Log duplicate found but not used
-                        logger.debug(f"Duplicate found for {polymer_name}, keeping existing (higher priority)")
-                        if polymer_name not in self.duplicate_stats:
-                            self.duplicate_stats[polymer_name] = {'count': 0, 'sources': []}
-                        self.duplicate_stats[polymer_name]['count'] += 1
-                        self.duplicate_stats[polymer_name]['sources'].append(
-                            f"{file_name}:{idx+2} (score: {priority_score}) [REJECTED]"
-                        )
-                else:
-                    # First occurrence
-                    polymer_registry[polymer_name] = row_dict
-
-        # Convert to list for DataFrame creation
-        final_data = list(polymer_registry.values())
+            # Calculate completeness and priority for the whole file, on the raw
+            # values (placeholders such as '-' count as present)
+            completeness = self.calculate_completeness(df, essential_cols)
+            priority_scores = self.calculate_priority_scores(df, file_name, completeness)
+
+            # Clean numeric fields for the whole file
+            df = self.clean_numeric_columns(df, file_name)
+
+            # Line numbers in the source file (+2 for header and 0-based position)
+            source_rows = np.arange(2, 2 + len(df), dtype=np.int32)
+
+            # Normalize polymer names for the whole column and skip empty ones
+            polymer_names = df['Polymer'].astype('string').str.strip()
+            has_name = (polymer_names.str.len() > 0) & (polymer_names.str.lower() != 'nan')
+            has_name = has_name.fillna(False).astype(bool)
+            rows = df[has_name]
+            key_frames.append(polymer_names[has_name])
+
+            # Add source information
+            frames.append(rows.assign(
+                source_file=file_name,
+                source_row=source_rows[has_name.to_numpy()],
+                priority_score=priority_scores[has_name],
+                completeness=completeness[has_name],
+                source_url=source_urls.get(file_name) if source_urls else None
+            ))
 
         # Create consolidated DataFrame
-        if final_data:
-            consolidated_df = pd.DataFrame(final_data)
-
-            # Sort by priority score (highest first)
-            consolidated_df = consolidated_df.sort_values('priority_score', ascending=False)
-
-            # Clean up temporary columns
-            columns_to_remove = ['priority_score']
-            consolidated_df = consolidated_df.drop(columns=[col for col in columns_to_remove if col in consolidated_df.columns])
-
-            return consolidated_df
+        if frames:
+            all_rows = pd.concat(frames, ignore_index=True, sort=False)
+            # One category per source file instead of a string reference per row
+            all_rows['source_file'] = all_rows['source_file'].astype('category')
+            keys = pd.concat(key_frames, ignore_index=True)
+            best_index = self.resolve_duplicates(all_rows, keys)
+
+            # Sort by priority score (highest first) and clean up temporary columns in a single selection
+            sorted_index = all_rows['priority_score'][best_index].sort_values(ascending=False).index
+            output_columns = all_rows.columns.drop('priority_score')
+
+            return all_rows.loc[sorted_index, output_columns]
         else:
             logger.error("No valid data found in any CSV files")
             return pd.DataFrame()
 
+    def write_csv(self, df: pd.DataFrame):
+        """Write a DataFrame as UTF-8 CSV with BOM, using the PyArrow writer when available"""
+        if PYARROW_AVAILABLE:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with open(self.output_file, 'wb') as f:
+                    f.write(b'\xef\xbb\xbf')  # BOM, as written by encoding='utf-8-sig'
+                    pa_csv.write_csv(table, f)
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                # Mixed-type object columns cannot be converted to Arrow
+                logger.debug("PyArrow writer failed (%s), using pandas writer", e)
+
+        df.to_csv(self.output_file, index=False, encoding='utf-8-sig')
+
     def save_consolidated_data(self, df: pd.DataFrame):
         """Save consolidated data to output file"""
         if df.empty:
@@ -289,7 +350,7 @@ class PolymerCSVConsolidator:
             self.output_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Save to CSV
-            df.to_csv(self.output_file, index=False, encoding='utf-8-sig')
+            self.write_csv(df)
             logger.info(f"Consolidated data saved to {self.output_file}")
             logger.info(f"Total records: {len(df)}")
 
@@ -310,8 +371,9 @@ class PolymerCSVConsolidator:
 
         for polymer, stats in self.duplicate_stats.items():
             logger.info(f"  {polymer}: {stats['count']} duplicates")
-            for source in stats['sources']:
-                logger.debug(f"    - {source}")
+            for file_name, source_row, priority_score, rejected in stats.get('sources', []):
+                logger.debug("    - %s:%s (score: %s)%s", file_name, source_row,
+                             priority_score, ' [REJECTED]' if rejected else '')
 
     def run(self, url_file: Path = None):
         """Main consolidation process"""
@@ -4,22 +4,119 @@ CSV Consolidation Script for MixingCompass
 Consolidates multiple CSV files with data richness priority handling for duplicates.
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import re
+import csv
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum number of CSV files read concurrently
+MAX_LOAD_WORKERS = 8
+
+# Use the multi-threaded PyArrow CSV writer when available (pandas writer otherwise).
+# Reading stays on the C parser: the PyArrow engine does not accept per-column na_values.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# RDKit is used to determine the CHO flag from SMILES when available
+try:
+    from rdkit import Chem
+    RDKIT_AVAILABLE = True
+except ImportError:
+    RDKIT_AVAILABLE = False
+
+# Regular expressions used per row, compiled once at import
+_TRADEMARK_RE = re.compile(r'[™®©]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_BASE_NAME_RE = re.compile(r'^(.+?)\s*\([^)]+\)\s*$')
+
+# Lookup sets used by determine_cho_only, built once at import
+_TRUE_TOKENS = frozenset(['true', 't', '1', 'yes', 'y'])
+_FALSE_TOKENS = frozenset(['false', 'f', '0', 'no', 'n'])
+_CHO_ELEMENTS = frozenset(['C', 'H', 'O'])
+
+# Columns written to the consolidated file (in this order)
+OUTPUT_COLUMNS = [
+    'Solvent', 'delta_D', 'delta_P', 'delta_H', 'delta_total',
+    'MWt', 'MVol', 'Density', 'Tb', 'Pv', 'Cost', 'WGK',
+    'CAS', 'Smiles', 'InChIKey', 'GHS', 'H', 'CHO',
+    'source_file', 'source_row', 'priority_score', 'completeness', 'source_url',
+]
+
+# Columns read from the source files: the output columns plus inputs of the CHO flag
+INPUT_COLUMNS = frozenset(OUTPUT_COLUMNS) | {'Molecular Formula'}
+
+# Columns counted by the completeness ratio. It is computed on the raw values,
+# as in the polymer script, so placeholders such as '-' count as present.
+COMPLETENESS_COLUMNS = ['delta_D', 'delta_P', 'delta_H']
+
+# Cell values treated as missing
+MISSING_VALUE_MARKERS = frozenset(['-', '–', '—', '', 'nan', 'NaN', 'NA', 'N/A'])
+
+# Numeric fields to clean: field -> (type, allow negative)
+NUMERIC_FIELDS = {
+    'WGK': ('int', False),           # integer, no negative
+    'delta_D': ('float', False),     # float, no negative
+    'delta_P': ('float', False),
+    'delta_H': ('float', False),
+    'MWt': ('float', False),
+    'MVol': ('float', False),
+    'Density': ('float', False),
+    'Tb': ('float', True),           # boiling point can be negative
+    'Pv': ('float', False),
+    'Cost': ('float', False),
+}
+
 
 class CSVConsolidator:
     """Consolidates multiple CSV files with intelligent duplicate handling"""
 
+    # Column mapping for different files
+    COLUMN_MAPPING = {
+        # Common mappings
+        'Solvents': 'Solvent',
+        'dD': 'delta_D',
+        'dP': 'delta_P',
+        'dH': 'delta_H',
+        'δt': 'delta_total',
+        'Volume': 'MVol',
+        'MWt (g/mol)': 'MWt',
+        'Molecular Weight': 'MWt',
+        'MVol (cm³/mol)': 'MVol',
+        'Molar Volume': 'MVol',
+        'Tv     (°C)': 'Tb',
+        'Tv': 'Tb',
+        'T_b': 'Tb',
+        'Boiling Point (C)': 'Tb',
+        'Pv  (hPa)': 'Pv',
+        'Density     (g/cm³)': 'Density',
+        'Density (g/L)': 'Density',
+        'Cost      (€/mL)': 'Cost',
+        'Cas': 'CAS'  # Normalize CAS number column name
+    }
+
+    # File priority weights (higher = better)
+    FILE_WEIGHTS = {
+        'JoshuaSchrier_Hansen-Solubility-Parameters': 3000,
+        'HSP_Calculations': 2000,
+        'Solvent List for calc': 1000
+    }
+    DEFAULT_FILE_WEIGHT = 500
+
     def __init__(self, input_dir: str, output_file: str):
         self.input_dir = Path(input_dir)
         self.output_file = Path(output_file)
@@ -27,30 +124,56 @@ class CSVConsolidator:
         self.duplicate_stats = {}
         self.rdkit_warning_shown = False  # Track if RDKit warning has been shown
 
+    def load_csv_file(self, csv_file: Path) -> Optional[pd.DataFrame]:
+        """Load a single CSV file, returning None on error"""
+        try:
+            # Parse only the columns used downstream, and let the parser turn the
+            # missing value markers of numeric fields into NaN (except the
+            # completeness columns, which keep their raw values until cleaning)
+            header = pd.read_csv(csv_file, encoding='utf-8-sig', nrows=0).columns
+            usecols = [col for col in header if self.COLUMN_MAPPING.get(col, col) in INPUT_COLUMNS]
+            na_values = {
+                col: list(MISSING_VALUE_MARKERS) for col in usecols
+                if self.COLUMN_MAPPING.get(col, col) in NUMERIC_FIELDS
+                and self.COLUMN_MAPPING.get(col, col) not in COMPLETENESS_COLUMNS
+            }
+            df = pd.read_csv(csv_file, encoding='utf-8-sig', usecols=usecols, na_values=na_values)
+            logger.info(f"Loaded {csv_file.name}: {len(df)} rows, {len(df.columns)} columns")
+            return df
+        except Exception as e:
+            logger.error(f"Error loading {csv_file.name}: {e}")
+            return None
+
     def load_csv_files(self) -> Dict[str, pd.DataFrame]:
         """Load all CSV files from input directory"""
-        csv_files = {}
-
-        for csv_file in self.input_dir.glob("*.csv"):
-            try:
-                df = pd.read_csv(csv_file, encoding='utf-8-sig')
-                csv_files[csv_file.stem] = df
-                logger.info(f"Loaded {csv_file.name}: {len(df)} rows, {len(df.columns)} columns")
-            except Exception as e:
-                logger.error(f"Error loading {csv_file.name}: {e}")
+        csv_paths = list(self.input_dir.glob("*.csv"))
+        if not csv_paths:
+            return {}
 
-        return csv_files
+        # read_csv releases the GIL while parsing, so files are read concurrently;
+        # map() keeps the glob order, which decides ties in duplicate resolution
+        # Parsing is CPU-bound, so more threads than cores do not help
+        max_workers = min(MAX_LOAD_WORKERS, len(csv_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataframes = list(executor.map(self.load_csv_file, csv_paths))
+
+        return {
+            csv_file.stem: df
+            for csv_file, df in zip(csv_paths, dataframes)
+            if df is not None
+        }
 
     def load_source_urls(self, url_file: Path) -> Dict[str, str]:
         """Load source URLs from list.csv"""
         try:
-            url_df = pd.read_csv(url_file)
-
-            # Create mapping from file name (without extension) to URL
-            url_mapping = {}
-            for _, row in url_df.iterrows():
-                file_name = Path(row['file']).stem  # Remove .csv extension
-                url_mapping[file_name] = row['URL']
+            # Small two-column file: read with the csv module, no DataFrame needed
+            with open(url_file, newline='', encoding='utf-8-sig') as f:
+                # Create mapping from file name (without extension) to URL
+                url_mapping = {
+                    row['file'].rsplit('.', 1)[0]: row['URL'] or None  # Remove .csv extension
+                    for row in csv.DictReader(f)
+                    if row.get('file')
+                }
 
             logger.info(f"Loaded {len(url_mapping)} source URL mappings")
             return url_mapping
@@ -59,60 +182,57 @@ class CSVConsolidator:
             logger.error(f"Error loading URL mapping file: {e}")
             return {}
 
-    def clean_numeric_field(self, value, field_type='int', allow_negative=True):
-        """Clean numeric field values"""
+    def clean_numeric_columns(self, df: pd.DataFrame, file_name: str) -> pd.DataFrame:
+        """Clean numeric columns in place, one vectorized pass per column"""
+        for field, (field_type, allow_negative) in NUMERIC_FIELDS.items():
+            if field not in df.columns:
+                continue
 
-        # Check for None/NaN/empty
-        if pd.isna(value):
-            return None
+            if pd.api.types.is_numeric_dtype(df[field]):
+                # Already parsed as numbers by read_csv (no copy for float64 columns)
+                result = df[field].astype(float, copy=False)
+            else:
+                # Treat missing value markers as NaN
+                values = df[field].astype('string').str.strip()
+                values = values.mask(values.isin(MISSING_VALUE_MARKERS))
+
+                # Handle space-separated multiple values (e.g., "1            2")
+                if field_type == 'int':
+                    values = values.str.split(n=1).str[0]
+
+                # Convert to numeric
+                result = pd.to_numeric(values, errors='coerce').astype(float)
+                unconvertible = result.isna() & values.notna()
+                if unconvertible.any():
+                    logger.warning(f"Cannot convert to {field_type} in {file_name}.{field}: "
+                                   f"{values[unconvertible].tolist()}")
 
-        # Handle string values
-        if isinstance(value, str):
-            value = value.strip()
-
-            # Check for missing value markers
-            if value in ['-', '–', '—', '', 'nan', 'NaN', 'NA', 'N/A']:
-                return None
-
-            # Handle space-separated multiple values (e.g., "1            2")
-            if ' ' in value and field_type == 'int':
-                # Get first numeric value
-                parts = value.split()
-                for part in parts:
-                    try:
-                        return int(float(part))
-                    except ValueError:
-                        continue
-                return None  # No numeric value found
-
-        # Convert to numeric
-        try:
             if field_type == 'int':
-                result = int(float(value))  # "1.0" -> 1
-                if not allow_negative and result < 0:
-                    return None
-                return result
-            else:  # float
-                result = float(value)
-                if not allow_negative and result < 0:
-                    return None
-                return result
-        except (ValueError, TypeError):
-            logger.warning(f"Cannot convert to {field_type}: {value}")
-            return None
+                result = np.trunc(result)  # "1.0" -> 1
+            if not allow_negative:
+                negative = result < 0
+                if negative.any():
+                    result = result.mask(negative)
+
+            if field_type == 'int':
+                # Narrowest nullable integer type that holds the values (WGK fits in Int8)
+                result = pd.to_numeric(result.astype('Int64'), downcast='integer')
+            df[field] = result
+
+        return df
+
+    def clean_solvent_names(self, names: pd.Series) -> pd.Series:
+        """Clean a column of solvent names by removing special characters and extra spaces"""
+        names = names.astype('string').str.strip()
 
-    def clean_solvent_name(self, name: str) -> str:
-        """Clean solvent name by removing special characters and extra spaces"""
         # Remove trademark symbols (™, ®, ©)
-        name = re.sub(r'[™®©]', '', name)
+        names = names.str.replace(_TRADEMARK_RE, '', regex=True)
 
         # Remove multiple spaces
-        name = re.sub(r'\s+', ' ', name)
+        names = names.str.replace(_WHITESPACE_RE, ' ', regex=True)
 
         # Strip whitespace
-        name = name.strip()
-
-        return name
+        return names.str.strip()
 
     def determine_cho_only(self, smiles: str = None, molecular_formula: str = None, cho_value: str = None) -> bool:
         """
@@ -127,162 +247,169 @@ class CSVConsolidator:
             True if CHO only, False if not, None if cannot determine
         """
         # Priority 1: Use existing CHO value from CSV if available
-        if cho_value is not None and str(cho_value).strip() not in ['', 'nan', 'NaN', 'NA', 'N/A', '-']:
+        if cho_value is not None and str(cho_value).strip() not in MISSING_VALUE_MARKERS:
             cho_str = str(cho_value).strip().lower()
-            if cho_str in ['true', 't', '1', 'yes', 'y']:
+            if cho_str in _TRUE_TOKENS:
                 return True
-            elif cho_str in ['false', 'f', '0', 'no', 'n']:
+            elif cho_str in _FALSE_TOKENS:
                 return False
 
         # Priority 2: Determine from SMILES using RDKit
-        if smiles is not None and str(smiles).strip() not in ['', 'nan', 'NaN', 'NA', 'N/A', '-']:
-            try:
-                from rdkit import Chem
-                mol = Chem.MolFromSmiles(smiles)
-                if mol:
-                    atoms = [atom.GetSymbol() for atom in mol.GetAtoms()]
-                    unique_elements = set(atoms)
-                    return unique_elements.issubset({'C', 'H', 'O'})
-            except ImportError:
-                if not self.rdkit_warning_shown:
-                    logger.warning("RDKit not available for SMILES analysis. CHO determination will be limited.")
-                    self.rdkit_warning_shown = True
-            except Exception as e:
-                logger.debug(f"Error parsing SMILES '{smiles}': {e}")
+        if smiles is not None and str(smiles).strip() not in MISSING_VALUE_MARKERS:
+            if RDKIT_AVAILABLE:
+                cho_result = self._cho_from_smiles(smiles)
+                if cho_result is not None:
+                    return cho_result
+            elif not self.rdkit_warning_shown:
+                logger.warning("RDKit not available for SMILES analysis. CHO determination will be limited.")
+                self.rdkit_warning_shown = True
 
         # Priority 3: Determine from Molecular Formula using regex
-        if molecular_formula is not None and str(molecular_formula).strip() not in ['', 'nan', 'NaN', 'NA', 'N/A', '-']:
-            try:
-                formula_str = str(molecular_formula).strip()
-                # Extract all element symbols (uppercase letter optionally followed by lowercase)
-                elements = re.findall(r'([A-Z][a-z]?)', formula_str)
-                unique_elements = set(elements)
-                return unique_elements.issubset({'C', 'H', 'O'})
-            except Exception as e:
-                logger.debug(f"Error parsing formula '{molecular_formula}': {e}")
+        if molecular_formula is not None and str(molecular_formula).strip() not in MISSING_VALUE_MARKERS:
+            return self._cho_from_formula(str(molecular_formula).strip())
 
         # Cannot determine
         return None
 
-    def extract_base_name(self, name: str) -> str:
-        """Extract base name without common name in parentheses for duplicate detection"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _cho_from_smiles(smiles: str) -> Optional[bool]:
+        """CHO-only check from SMILES, cached since the same SMILES recur across files"""
+        try:
+            mol = Chem.MolFromSmiles(smiles)
+            if mol:
+                return {atom.GetSymbol() for atom in mol.GetAtoms()}.issubset(_CHO_ELEMENTS)
+        except Exception as e:
+            logger.debug("Error parsing SMILES '%s': %s", smiles, e)
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _cho_from_formula(formula_str: str) -> bool:
+        """CHO-only check from a molecular formula, cached by formula string"""
+        # Scan element symbols (uppercase letter optionally followed by lowercase)
+        # and stop at the first element other than C, H, O
+        length = len(formula_str)
+        for i, char in enumerate(formula_str):
+            if 'A' <= char <= 'Z':
+                symbol = char
+                if i + 1 < length and 'a' <= formula_str[i + 1] <= 'z':
+                    symbol += formula_str[i + 1]
+                if symbol not in _CHO_ELEMENTS:
+                    return False
+        return True
+
+    def extract_base_names(self, names: pd.Series) -> pd.Series:
+        """Extract base names without common names in parentheses for duplicate detection"""
         # Remove content in parentheses if it looks like a common name
         # Keep if it's a chemical formula (contains numbers or special patterns)
-        match = re.match(r'^(.+?)\s*\([^)]+\)\s*$', name)
-        if match:
-            base = match.group(1).strip()
-            # Only use base name if something meaningful remains
-            if base:
-                return base
-        return name
+        bases = names.str.extract(_BASE_NAME_RE, expand=False).str.strip()
+        # Only use base name if something meaningful remains
+        return bases.where(bases.notna() & (bases != ''), names)
 
     def normalize_column_names(self, df: pd.DataFrame, file_name: str) -> pd.DataFrame:
         """Normalize column names to standard format"""
-        df = df.copy()
-
-        # Column mapping for different files
-        column_mapping = {
-            # Common mappings
-            'Solvents': 'Solvent',
-            'dD': 'delta_D',
-            'dP': 'delta_P',
-            'dH': 'delta_H',
-            'δt': 'delta_total',
-            'Volume': 'MVol',
-            'MWt (g/mol)': 'MWt',
-            'Molecular Weight': 'MWt',
-            'MVol (cm³/mol)': 'MVol',
-            'Molar Volume': 'MVol',
-            'Tv     (°C)': 'Tb',
-            'Tv': 'Tb',
-            'T_b': 'Tb',
-            'Boiling Point (C)': 'Tb',
-            'Pv  (hPa)': 'Pv',
-            'Density     (g/cm³)': 'Density',
-            'Density (g/L)': 'Density',
-            'Cost      (€/mL)': 'Cost',
-            'Cas': 'CAS'  # Normalize CAS number column name
-        }
 
-        # Apply mappings
-        df.columns = [column_mapping.get(col, col) for col in df.columns]
+        # Apply mappings (renaming only the column index, without copying the data)
+        df = df.rename(columns=self.COLUMN_MAPPING, copy=False)
 
         # Ensure essential columns exist
         essential_columns = ['Solvent', 'delta_D', 'delta_P', 'delta_H']
-        for col in essential_columns:
-            if col not in df.columns:
-                logger.warning(f"Missing essential column '{col}' in {file_name}")
+        missing = [col for col in essential_columns if col not in df.columns]
+        if missing:
+            logger.warning("Missing essential columns %s in %s", missing, file_name)
 
         return df
 
-    def calculate_priority_score(self, file_name: str, row_index: int,
-                               total_rows: int, completeness_ratio: float,
-                               row: pd.Series = None) -> int:
-        """Calculate priority score for duplicate resolution"""
-
-        # File priority weights (higher = better)
-        file_weights = {
-            'JoshuaSchrier_Hansen-Solubility-Parameters': 3000,
-            'HSP_Calculations': 2000,
-            'Solvent List for calc': 1000
-        }
+    def calculate_priority_scores(self, df: pd.DataFrame, file_name: str,
+                                  completeness: pd.Series) -> pd.Series:
+        """Calculate priority scores for duplicate resolution for all rows of a file"""
 
         # Get base file weight
-        base_weight = file_weights.get(file_name, 500)
+        base_weight = self.FILE_WEIGHTS.get(file_name, self.DEFAULT_FILE_WEIGHT)
 
         # Row position bonus (earlier rows get higher priority)
-        position_bonus = total_rows - row_index
+        position_bonus = pd.Series(len(df) - np.arange(len(df)), index=df.index)
 
         # Data completeness bonus
-        completeness_bonus = int(completeness_ratio * 100)
+        completeness_bonus = (completeness * 100).astype(int)
+
+        def has_value(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series(False, index=df.index)
+            values = df[col]
+            return values.notna() & ~values.astype(str).str.strip().isin(MISSING_VALUE_MARKERS)
 
         # Boiling point (Tb) bonus - high priority
-        tb_bonus = 0
-        if row is not None and 'Tb' in row.index:
-            tb_value = row['Tb']
-            if pd.notna(tb_value) and str(tb_value).strip() not in ['', '-', 'nan', 'NaN', 'NA', 'N/A']:
-                tb_bonus = 500  # Significant bonus for having Tb data
+        tb_bonus = has_value('Tb') * 500  # Significant bonus for having Tb data
 
         # CAS number bonus - high priority
-        cas_bonus = 0
-        if row is not None and 'CAS' in row.index:
-            cas_value = row['CAS']
-            if pd.notna(cas_value) and str(cas_value).strip() not in ['', '-', 'nan', 'NaN', 'NA', 'N/A']:
-                cas_bonus = 500  # Significant bonus for having CAS data
+        cas_bonus = has_value('CAS') * 500  # Significant bonus for having CAS data
 
         total_score = base_weight + position_bonus + completeness_bonus + tb_bonus + cas_bonus
 
         return total_score
 
-    def calculate_completeness(self, row: pd.Series, essential_cols: List[str]) -> float:
-        """Calculate data completeness ratio for a row"""
+    def calculate_completeness(self, df: pd.DataFrame, essential_cols: List[str]) -> pd.Series:
+        """Calculate data completeness ratio for all rows of a file"""
         if not essential_cols:
-            return 1.0
+            return pd.Series(1.0, index=df.index)
+
+        # Columns absent from the file count as missing for every row
+        present_cols = [col for col in essential_cols if col in df.columns]
+        non_null_count = np.zeros(len(df), dtype=np.int64)
+        for col in present_cols:
+            non_null_count += df[col].notna().to_numpy()
+        return pd.Series(non_null_count / len(essential_cols), index=df.index)
+
+    def resolve_duplicates(self, all_rows: pd.DataFrame, keys: pd.Series) -> pd.Index:
+        """
+        Keep the highest priority row for each duplicate key
+
+        Args:
+            all_rows: Cleaned rows of all files in processing order
+            keys: Duplicate detection key (lowercase base name) of each row
+
+        Returns:
+            Index of one row per key, in order of first occurrence; ties keep the earliest row
+        """
+        scores = all_rows['priority_score']
+
+        # idxmax keeps the earliest row among equal scores; sort=False lists the keys
+        # in order of first occurrence
+        best_index = pd.Index(scores.groupby(keys, sort=False).idxmax().to_numpy())
+
+        # Update duplicate stats: every later occurrence either replaced the best so far or was rejected
+        # Only rows whose key occurs more than once need the running best score
+        repeated = keys.duplicated(keep=False)
+        repeated_keys = keys[repeated]
+        best_so_far = scores[repeated].groupby(repeated_keys).cummax().groupby(repeated_keys).shift().dropna()
+        duplicate_keys = keys[best_so_far.index]
+        for key, count in duplicate_keys.groupby(duplicate_keys, sort=False).size().items():
+            self.duplicate_stats.setdefault(key, {'count': 0})['count'] += count
+
+        # Per-duplicate sources are only consumed by debug logging
+        if logger.isEnabledFor(logging.DEBUG):
+            for key, file_name, source_row, solvent_name, priority_score, previous_best in zip(
+                    duplicate_keys, all_rows['source_file'][best_so_far.index],
+                    all_rows['source_row'][best_so_far.index], all_rows['Solvent'][best_so_far.index],
+                    scores[best_so_far.index], best_so_far):
+                rejected = priority_score <= previous_best
+                if rejected:
+                    logger.debug("Duplicate found for %s, keeping existing (higher priority)", solvent_name)
+                else:
+                    logger.debug("Replacing '%s' with '%s': %d -> %d", key, solvent_name, previous_best, priority_score)
+                self.duplicate_stats[key].setdefault('sources', []).append(
+                    (file_name, source_row, solvent_name, priority_score, rejected)
+                )
 
-        non_null_count = sum(1 for col in essential_cols if col in row.index and pd.notna(row[col]))
-        return non_null_count / len(essential_cols)
+        return best_index
 
     def consolidate_files(self, csv_files: Dict[str, pd.DataFrame], source_urls: Dict[str, str] = None) -> pd.DataFrame:
         """Consolidate all CSV files with duplicate handling"""
 
-        all_data = []
-        solvent_registry = {}  # Track solvents and their priority scores
-
-        essential_cols = ['delta_D', 'delta_P', 'delta_H']
-
-        # Define numeric fields to clean
-        numeric_fields = {
-            'WGK': ('int', False),           # integer, no negative
-            'delta_D': ('float', False),     # float, no negative
-            'delta_P': ('float', False),
-            'delta_H': ('float', False),
-            'MWt': ('float', False),
-            'MVol': ('float', False),
-            'Density': ('float', False),
-            'Tb': ('float', True),           # boiling point can be negative
-            'Pv': ('float', False),
-            'Cost': ('float', False),
-        }
+        frames = []  # Cleaned rows of each file
+        key_frames = []  # Duplicate detection keys of each file
 
         # Process each file
         for file_name, df in csv_files.items():
@@ -296,116 +423,87 @@ class CSVConsolidator:
                 logger.warning(f"No 'Solvent' column found in {file_name}, skipping...")
                 continue
 
-            total_rows = len(df)
-
-            # Process each row
-            for idx, row in df.iterrows():
-                solvent_name = str(row['Solvent']).strip()
-
-                # Clean solvent name (remove special characters)
-                solvent_name = self.clean_solvent_name(solvent_name)
-
-                # Skip empty solvent names
-                if not solvent_name or solvent_name.lower() in ['nan', '']:
-                    continue
-
-                # Extract base name for duplicate detection (remove common names in parentheses)
-                base_name = self.extract_base_name(solvent_name)
-                # Use lowercase base_name as key for case-insensitive matching
-                base_name_lower = base_name.lower()
-
-                # Calculate completeness and priority
-                completeness = self.calculate_completeness(row, essential_cols)
-                priority_score = self.calculate_priority_score(
-                    file_name, idx, total_rows, completeness, row
-                )
-
-                # Add source information
-                row_dict = row.to_dict()
-
-                # Update cleaned solvent name in row_dict (keep full name with common name)
-                row_dict['Solvent'] = solvent_name
-
-                # Clean numeric fields
-                for field, (dtype, allow_neg) in numeric_fields.items():
-                    if field in row_dict:
-                        row_dict[field] = self.clean_numeric_field(
-                            row_dict[field],
-                            field_type=dtype,
-                            allow_negative=allow_neg
-                        )
-
-                # Determine CHO (C, H, O only) flag
-                smiles = row_dict.get('Smiles', None)
-                molecular_formula = row_dict.get('Molecular Formula', None)
-                existing_cho = row_dict.get('CHO', None)
-                cho_result = self.determine_cho_only(
-                    smiles=smiles,
-                    molecular_formula=molecular_formula,
-                    cho_value=existing_cho
+            # Calculate completeness and priority for the whole file, on the raw
+            # values (placeholders such as '-' count as present)
+            completeness = self.calculate_completeness(df, COMPLETENESS_COLUMNS)
+            priority_scores = self.calculate_priority_scores(df, file_name, completeness)
+
+            # Clean numeric fields for the whole file
+            df = self.clean_numeric_columns(df, file_name)
+
+            # Line numbers in the source file (+2 for header and 0-based position)
+            source_rows = np.arange(2, 2 + len(df), dtype=np.int32)
+
+            # Clean solvent names (remove special characters) for the whole column
+            solvent_names = self.clean_solvent_names(df['Solvent'])
+
+            # Skip empty solvent names
+            has_name = (solvent_names.str.len() > 0) & (solvent_names.str.lower() != 'nan')
+            has_name = has_name.fillna(False).astype(bool)
+            rows = df[has_name]
+            solvent_names = solvent_names[has_name]
+
+            # Extract base names for duplicate detection (remove common names in parentheses)
+            # and lowercase them as keys for case-insensitive matching
+            key_frames.append(self.extract_base_names(solvent_names).str.lower())
+
+            # Determine CHO (C, H, O only) flag
+            cho_results = [
+                self.determine_cho_only(smiles=smiles, molecular_formula=molecular_formula, cho_value=existing_cho)
+                for smiles, molecular_formula, existing_cho in zip(
+                    rows.get('Smiles', [None] * len(rows)),
+                    rows.get('Molecular Formula', [None] * len(rows)),
+                    rows.get('CHO', [None] * len(rows))
                 )
-                row_dict['CHO'] = cho_result
-
-                row_dict['source_file'] = file_name
-                row_dict['source_row'] = idx + 2  # +2 for header and 0-based index
-                row_dict['priority_score'] = priority_score
-                row_dict['completeness'] = completeness
-
-                # Add source URL if available
-                if source_urls and file_name in source_urls:
-                    row_dict['source_url'] = source_urls[file_name]
-                else:
-                    row_dict['source_url'] = None
-
-                # Handle duplicates (use base_name_lower as key for case-insensitive matching)
-                if base_name_lower in solvent_registry:
-                    existing_score = solvent_registry[base_name_lower]['priority_score']
-                    existing_name = solvent_registry[base_name_lower]['Solvent']
-
-                    if priority_score > existing_score:
-                        # Replace with higher priority data
-                        logger.debug(f"Replacing '{existing_name}' with '{solvent_name}': {existing_score} -> {priority_score}")
-                        solvent_registry[base_name_lower] = row_dict
-
-                        # Update duplicate stats
-                        if base_name_lower not in self.duplicate_stats:
-                            self.duplicate_stats[base_name_lower] = {'count': 0, 'sources': []}
-                        self.duplicate_stats[base_name_lower]['count'] += 1
-                        self.duplicate_stats[base_name_lower]['sources'].append(
-                            f"{file_name}:{idx+2} '{solvent_name}' (score: {priority_score})"
-                        )
-                    else:
-                        # Log duplicate found but not used
-                        logger.debug(f"Duplicate found for {solvent_name}, keeping existing '{existing_name}' (higher priority)")
-                        if base_name_lower not in self.duplicate_stats:
-                            self.duplicate_stats[base_name_lower] = {'count': 0, 'sources': []}
-                        self.duplicate_stats[base_name_lower]['count'] += 1
-                        self.duplicate_stats[base_name_lower]['sources'].append(
-                            f"{file_name}:{idx+2} '{solvent_name}' (score: {priority_score}) [REJECTED]"
-                        )
-                else:
-                    # First occurrence
-                    solvent_registry[base_name_lower] = row_dict
-
-        # Convert to list for DataFrame creation
-        final_data = list(solvent_registry.values())
+            ]
+
+            # Keep cleaned solvent names (full name with common name) and add source information
+            rows = rows.assign(
+                Solvent=solvent_names,
+                CHO=pd.array(cho_results, dtype='boolean'),
+                source_file=file_name,
+                source_row=source_rows[has_name.to_numpy()],
+                priority_score=priority_scores[has_name],
+                completeness=completeness[has_name],
+                source_url=source_urls.get(file_name) if source_urls else None
+            )
+
+            # Keep only the columns used downstream
+            frames.append(rows[[col for col in OUTPUT_COLUMNS if col in rows.columns]])
 
         # Create consolidated DataFrame
-        if final_data:
-            consolidated_df = pd.DataFrame(final_data)
-
-            # Sort by priority score (highest first)
-            consolidated_df = consolidated_df.sort_values('priority_score', ascending=False)
-
-            # Clean up temporary columns
-            columns_to_remove = ['priority_score']
-            consolidated_df = consolidated_df.drop(columns=[col for col in columns_to_remove if col in consolidated_df.columns])
-
-            return consolidated_df
+        if frames:
+            all_rows = pd.concat(frames, ignore_index=True, sort=False)
+            # One category per source file instead of a string reference per row
+            all_rows['source_file'] = all_rows['source_file'].astype('category')
+            all_rows = all_rows[[col for col in OUTPUT_COLUMNS if col in all_rows.columns]]
+            keys = pd.concat(key_frames, ignore_index=True)
+            best_index = self.resolve_duplicates(all_rows, keys)
+
+            # Sort by priority score (highest first) and clean up temporary columns in a single selection
+            sorted_index = all_rows['priority_score'][best_index].sort_values(ascending=False).index
+            output_columns = all_rows.columns.drop('priority_score')
+
+            return all_rows.loc[sorted_index, output_columns]
         else:
             logger.error("No valid data found in any CSV files")
             return pd.DataFrame()
 
+    def write_csv(self, df: pd.DataFrame):
+        """Write a DataFrame as UTF-8 CSV with BOM, using the PyArrow writer when available"""
+        if PYARROW_AVAILABLE:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with open(self.output_file, 'wb') as f:
+                    f.write(b'\xef\xbb\xbf')  # BOM, as written by encoding='utf-8-sig'
+                    pa_csv.write_csv(table, f)
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                # Mixed-type object columns cannot be converted to Arrow
+                logger.debug("PyArrow writer failed (%s), using pandas writer", e)
+
+        df.to_csv(self.output_file, index=False, encoding='utf-8-sig')
+
     def save_consolidated_data(self, df: pd.DataFrame):
         """Save consolidated data to output file"""
         if df.empty:
@@ -417,7 +515,7 @@ class CSVConsolidator:
             self.output_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Save to CSV
-            df.to_csv(self.output_file, index=False, encoding='utf-8-sig')
+            self.write_csv(df)
             logger.info(f"Consolidated data saved to {self.output_file}")
             logger.info(f"Total records: {len(df)}")
 
@@ -438,8 +536,9 @@ class CSVConsolidator:
 
         for solvent, stats in self.duplicate_stats.items():
             logger.info(f"  {solvent}: {stats['count']} duplicates")
-            for source in stats['sources']:
-                logger.debug(f"    - {source}")
+            for file_name, source_row, solvent_name, priority_score, rejected in stats.get('sources', []):
+                logger.debug("    - %s:%s '%s' (score: %s)%s", file_name, source_row, solvent_name,
+                             priority_score, ' [REJECTED]' if rejected else '')
 
     def run(self, url_file: Path = None):
         """Main consolidation process"""
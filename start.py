@@ -3,19 +3,40 @@
 MixingCompass - Port Management and Application Startup Script
 """
 
+from __future__ import annotations
+
 import os
 import socket
 import sys
 import subprocess
-import psutil
 import time
 import platform
 import shutil
 import pathlib
-from typing import Optional, List
+from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+
+# psutil is imported inside the PortManager methods that need it: it is only
+# required when the target port is busy, so a free port starts without it
 
-# Disable Python bytecode generation in development to avoid cache issues
+# Disable Python bytecode generation in development to avoid cache issues.
+# The environment variable covers reloader subprocesses; the flag covers the
+# app imported by uvicorn in this process.
 os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
+sys.dont_write_bytecode = True
+
+# How long to wait for a cleared port to be released, and how often to check (seconds)
+PORT_WAIT_TIMEOUT = 5.0
+PORT_POLL_INTERVAL = 0.01
+
+# Seconds a psutil port -> PID scan is reused before rescanning
+PORT_PID_CACHE_TTL = 0.5
+
+# Threads used to delete __pycache__ directories
+CACHE_CLEAR_WORKERS = 8
+
+# Newest app/*.py mtime at the last successful cache clear
+CACHE_STAMP_FILE = pathlib.Path('.startup_cache_stamp')
 
 
 class PortManager:
@@ -24,28 +45,112 @@ class PortManager:
     def __init__(self, default_port: int = 8200):
         self.default_port = default_port
         self.is_windows = platform.system() == "Windows"
+        self.is_linux = platform.system() == "Linux"
+        # Port -> PIDs from the last psutil connection scan, see _get_port_pid_map
+        self._port_pids_cache = None
+        self._port_pids_cache_time = 0.0
 
     def is_port_in_use(self, port: int) -> bool:
-        """Check if a port is currently in use"""
+        """Check if a port is currently in use by trying to bind it"""
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            result = sock.connect_ex(('localhost', port))
-            return result == 0
+            # Ignore sockets lingering in TIME_WAIT; on Windows SO_REUSEADDR would
+            # allow binding over an active listener, so it is only set elsewhere
+            if not self.is_windows:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                # Same address uvicorn binds to in start_application
+                sock.bind(('0.0.0.0', port))
+                return False
+            except OSError:
+                return True
+
+    def _find_processes_linux(self, port: int) -> Optional[List[int]]:
+        """
+        Find process IDs using a port by reading /proc directly (Linux only).
+        Only the TCP tables are read, instead of every socket table for every process.
+
+        Returns:
+            List of PIDs, or None if the lookup was incomplete and psutil should be used
+        """
+        inodes = set()
+        tables_read = 0
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table) as f:
+                    next(f)  # Skip header
+                    for line in f:
+                        # Columns: sl, local_address (hex ADDR:PORT), rem_address, st, ..., inode
+                        fields = line.split()
+                        if int(fields[1].rsplit(':', 1)[1], 16) == port and fields[9] != '0':
+                            inodes.add(fields[9])
+                tables_read += 1
+            except FileNotFoundError:
+                continue  # tcp6 is absent when IPv6 is disabled
+            except (OSError, IndexError, ValueError):
+                return None
+
+        if not tables_read:
+            return None
+        if not inodes:
+            return []
+
+        # Map socket inodes to the processes holding them
+        targets = {f'socket:[{inode}]' for inode in inodes}
+        processes = []
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            try:
+                for fd in os.scandir(f'/proc/{entry.name}/fd'):
+                    if os.readlink(fd.path) in targets:
+                        processes.append(int(entry.name))
+                        break
+            except OSError:
+                # Process exited or its fds are not readable by this user
+                continue
+
+        # Sockets owned by processes we cannot inspect: let psutil report it
+        return processes or None
+
+    def _get_port_pid_map(self) -> Dict[int, List[int]]:
+        """
+        Map every local TCP port to the PIDs using it with one psutil scan.
+        The map is reused for PORT_PID_CACHE_TTL seconds so repeated lookups
+        do not rescan every connection on the system.
+        """
+        import psutil
+
+        now = time.monotonic()
+        if self._port_pids_cache is None or now - self._port_pids_cache_time > PORT_PID_CACHE_TTL:
+            port_pids = {}
+            # The server listens on TCP; UDP sockets on the same port do not block it
+            for conn in psutil.net_connections(kind='tcp'):
+                if conn.laddr and conn.pid:
+                    pids = port_pids.setdefault(conn.laddr.port, [])
+                    if conn.pid not in pids:
+                        pids.append(conn.pid)
+            self._port_pids_cache = port_pids
+            self._port_pids_cache_time = now
+        return self._port_pids_cache
 
     def find_processes_using_port(self, port: int) -> List[int]:
         """Find all process IDs using the specified port (Windows compatible)"""
+        if self.is_linux:
+            processes = self._find_processes_linux(port)
+            if processes is not None:
+                return processes
+
+        import psutil
+
         processes = []
         try:
-            connections = psutil.net_connections(kind='inet')
-            for conn in connections:
-                if conn.laddr and conn.laddr.port == port:
-                    if conn.pid and conn.pid not in processes:
-                        processes.append(conn.pid)
+            processes = list(self._get_port_pid_map().get(port, []))
         except psutil.AccessDenied:
             print(f"Access denied when checking connections. Trying alternative method...")
             # Alternative method for Windows
             if self.is_windows:
                 try:
-                    result = subprocess.run(['netstat', '-ano'],
+                    result = subprocess.run(['netstat', '-ano', '-p', 'tcp'],
                                           capture_output=True, text=True, timeout=10)
                     for line in result.stdout.split('\n'):
                         if f':{port} ' in line and 'LISTENING' in line:
@@ -64,6 +169,16 @@ class PortManager:
 
         return processes
 
+    @staticmethod
+    def _process_name(process: psutil.Process) -> str:
+        """Process name for messages, 'unknown' if it cannot be read"""
+        import psutil
+
+        try:
+            return process.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return 'unknown'
+
     def kill_process_tree(self, process: psutil.Process, force_wait: int = 5) -> bool:
         """
         Kill a process and all its children recursively.
@@ -76,81 +191,114 @@ class PortManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            process_name = process.name() if hasattr(process, 'name') else 'unknown'
-            pid = process.pid
+        return self.kill_process_trees([process], force_wait=force_wait)
+
+    def kill_process_trees(self, processes: List[psutil.Process], force_wait: int = 5) -> bool:
+        """
+        Kill several processes and all their children recursively.
+        Each stage is signalled for all processes first and then waited on as one
+        batch with psutil.wait_procs, so the waits overlap instead of adding up.
+
+        Args:
+            processes: The psutil.Process instances to kill
+            force_wait: Seconds to wait before force killing (default: 5)
 
-            # First, recursively kill all children
+        Returns:
+            True if all processes terminated, False otherwise
+        """
+        import psutil
+
+        # First, kill all children of every target
+        children = []
+        for process in processes:
             try:
-                children = process.children(recursive=True)
-                if children:
-                    print(f"  Found {len(children)} child process(es) under {pid}")
-                    for child in children:
-                        try:
-                            child_name = child.name() if hasattr(child, 'name') else 'unknown'
-                            print(f"  Terminating child process {child.pid} ({child_name})...")
-                            child.terminate()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
-
-                    # Wait for children to terminate
-                    gone, alive = psutil.wait_procs(children, timeout=3)
-
-                    # Force kill any remaining children
-                    for child in alive:
-                        try:
-                            print(f"  Force killing child process {child.pid}...")
-                            child.kill()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
+                found = process.children(recursive=True)
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 # Process might have already terminated or we don't have access
+                continue
+            if found:
+                print(f"  Found {len(found)} child process(es) under {process.pid}")
+                children.extend(found)
+
+        for child in children:
+            try:
+                print(f"  Terminating child process {child.pid} ({self._process_name(child)})...")
+                child.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
 
-            # Now kill the parent process
-            print(f"Terminating process {pid} ({process_name})...")
-            process.terminate()
+        if children:
+            # Wait for children to terminate, then force kill any remaining
+            gone, alive = psutil.wait_procs(children, timeout=3)
+            for child in alive:
+                try:
+                    print(f"  Force killing child process {child.pid}...")
+                    child.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
 
-            # Wait for graceful termination
+        # Now terminate the parent processes
+        success = True
+        pending = []
+        for process in processes:
+            pid = process.pid
+            try:
+                print(f"Terminating process {pid} ({self._process_name(process)})...")
+                process.terminate()
+                pending.append(process)
+            except psutil.NoSuchProcess:
+                print(f"Process {pid} already terminated.")
+            except psutil.AccessDenied as e:
+                print(f"Access denied when trying to terminate process {pid}: {e}")
+                if self.is_windows:
+                    print(f"Try running as Administrator to terminate process {pid}")
+                success = False
+            except Exception as e:
+                print(f"Unexpected error terminating process {pid}: {e}")
+                success = False
+
+        if not pending:
+            return success
+
+        # Wait for graceful termination
+        gone, alive = psutil.wait_procs(pending, timeout=force_wait)
+        for process in gone:
+            print(f"Process {process.pid} terminated gracefully.")
+
+        for process in alive:
+            print(f"Process {process.pid} did not terminate gracefully. Force killing...")
             try:
-                process.wait(timeout=force_wait)
-                print(f"Process {pid} terminated gracefully.")
-                return True
-            except psutil.TimeoutExpired:
-                print(f"Process {pid} did not terminate gracefully. Force killing...")
                 process.kill()
-                try:
-                    process.wait(timeout=3)
-                    print(f"Process {pid} was force killed.")
-                    return True
-                except psutil.TimeoutExpired:
-                    print(f"Failed to force kill process {pid}.")
-                    return False
-
-        except psutil.NoSuchProcess:
-            print(f"Process {pid} already terminated.")
-            return True
-        except psutil.AccessDenied as e:
-            print(f"Access denied when trying to terminate process {pid}: {e}")
-            if self.is_windows:
-                print(f"Try running as Administrator to terminate process {pid}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error terminating process {pid}: {e}")
-            return False
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied as e:
+                print(f"Access denied when trying to kill process {process.pid}: {e}")
+
+        if alive:
+            gone, alive = psutil.wait_procs(alive, timeout=3)
+            for process in gone:
+                print(f"Process {process.pid} was force killed.")
+            for process in alive:
+                print(f"Failed to force kill process {process.pid}.")
+                success = False
+
+        return success
 
     def kill_process_on_port(self, port: int, force: bool = True) -> bool:
         """Kill all processes using the specified port, including their child processes"""
+        import psutil
+
         pids = self.find_processes_using_port(port)
         if not pids:
             print(f"No process found using port {port}.")
             return True
 
         success = True
+        targets = []
         for pid in pids:
             try:
                 process = psutil.Process(pid)
-                process_name = process.name() if hasattr(process, 'name') else 'unknown'
+                process_name = self._process_name(process)
                 print(f"Found process {pid} ({process_name}) using port {port}.")
 
                 if not force:
@@ -159,9 +307,7 @@ class PortManager:
                         print(f"Skipping process {pid}")
                         continue
 
-                # Kill the entire process tree
-                if not self.kill_process_tree(process, force_wait=5):
-                    success = False
+                targets.append(process)
 
             except psutil.NoSuchProcess:
                 print(f"Process {pid} already terminated.")
@@ -169,8 +315,36 @@ class PortManager:
                 print(f"Unexpected error with process {pid}: {e}")
                 success = False
 
+        # Kill all selected process trees together
+        if targets and not self.kill_process_trees(targets, force_wait=5):
+            success = False
+
+        # Connections changed, rescan on the next lookup
+        self._port_pids_cache = None
+
         return success
 
+    def _wait_port_free(self, port: int, timeout: float = PORT_WAIT_TIMEOUT,
+                        interval: float = PORT_POLL_INTERVAL) -> bool:
+        """
+        Poll until the port can be bound, returning as soon as it is released
+
+        Args:
+            port: Port number to wait for
+            timeout: Maximum seconds to wait
+            interval: Seconds between bind checks
+
+        Returns:
+            True if the port became free within the timeout, False otherwise
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self.is_port_in_use(port):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
     def get_available_port(self, start_port: int = None) -> int:
         """Find an available port starting from the specified port"""
         if start_port is None:
@@ -182,7 +356,15 @@ class PortManager:
                 return port
             port += 1
 
-        raise RuntimeError(f"No available port found in range {start_port}-{start_port + 99}")
+        print(f"No available port found in range {start_port}-{start_port + 99}. "
+              f"Requesting a free port from the system...")
+        return self.get_ephemeral_port()
+
+    def get_ephemeral_port(self) -> int:
+        """Let the kernel pick a free port (bind to port 0) instead of scanning"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('0.0.0.0', 0))
+            return sock.getsockname()[1]
 
     def prepare_port(self, port: int = None, force_kill: bool = True, allow_alternative: bool = False) -> int:
         """
@@ -205,13 +387,10 @@ class PortManager:
             if force_kill:
                 print(f"Force clearing port {port}...")
                 if self.kill_process_on_port(port, force=True):
-                    # Wait for port to be freed
-                    for attempt in range(5):
-                        time.sleep(1)
-                        if not self.is_port_in_use(port):
-                            print(f"Port {port} is now available.")
-                            return port
-                        print(f"Waiting for port {port} to be freed... (attempt {attempt + 1}/5)")
+                    print(f"Waiting for port {port} to be freed...")
+                    if self._wait_port_free(port):
+                        print(f"Port {port} is now available.")
+                        return port
 
                     # Port still in use after multiple attempts
                     print(f"Port {port} still in use after clearing processes.")
@@ -236,8 +415,7 @@ class PortManager:
                 response = input(f"Port {port} is in use. Clear it? (y/n): ").lower()
                 if response == 'y':
                     if self.kill_process_on_port(port, force=False):
-                        time.sleep(2)
-                        if not self.is_port_in_use(port):
+                        if self._wait_port_free(port):
                             print(f"Port {port} is now available.")
                             return port
 
@@ -253,44 +431,105 @@ class PortManager:
         return port
 
 
+def scan_source_tree(root: str):
+    """
+    Walk a source tree once with os.scandir
+
+    Returns:
+        Tuple of (newest .py modification time, list of __pycache__ directory paths)
+    """
+    latest_mtime = 0.0
+    cache_dirs = []
+    pending = [root]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                # DirEntry caches the file type, so no extra stat call per entry
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == '__pycache__':
+                        cache_dirs.append(entry.path)
+                    else:
+                        pending.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    latest_mtime = max(latest_mtime, entry.stat().st_mtime)
+    return latest_mtime, cache_dirs
+
+
 def clear_python_cache():
     """Clear Python bytecode cache to ensure code changes are reflected"""
+    # Skip the clear when no source file changed since the last successful one
+    latest_mtime, cache_dirs = scan_source_tree('app')
+    try:
+        if latest_mtime <= float(CACHE_STAMP_FILE.read_text()):
+            print("Python sources unchanged since last cache clear, skipping.")
+            return
+    except (OSError, ValueError):
+        pass  # No stamp yet or unreadable: clear as usual
+
     print("Clearing Python cache...")
     cache_cleared = False
 
-    for cache_dir in pathlib.Path('app').rglob('__pycache__'):
+    def remove_cache_dir(cache_dir) -> Optional[Exception]:
         try:
             shutil.rmtree(cache_dir)
+            return None
+        except Exception as e:
+            return e
+
+    # Deleting many small files is I/O bound, so remove the directories in parallel
+    with ThreadPoolExecutor(max_workers=CACHE_CLEAR_WORKERS) as executor:
+        errors = list(executor.map(remove_cache_dir, cache_dirs))
+
+    for cache_dir, error in zip(cache_dirs, errors):
+        if error is None:
             print(f"  [OK] Cleared: {cache_dir}")
             cache_cleared = True
-        except Exception as e:
-            print(f"  [WARNING] Could not clear {cache_dir}: {e}")
+        else:
+            print(f"  [WARNING] Could not clear {cache_dir}: {error}")
 
     if not cache_cleared:
         print("  No cache found (this is normal on first run)")
     else:
         print("Cache cleared successfully.")
 
+    if not any(errors):
+        try:
+            CACHE_STAMP_FILE.write_text(repr(latest_mtime))
+        except OSError as e:
+            print(f"  [WARNING] Could not write {CACHE_STAMP_FILE}: {e}")
+
+
+def start_application(port: int, reload: bool = False, workers: int = 1):
+    """
+    Start the FastAPI application
 
-def start_application(port: int):
-    """Start the FastAPI application"""
+    Args:
+        port: Port to listen on
+        reload: If True, run uvicorn with the file watcher (development)
+        workers: Number of worker processes (ignored with reload)
+    """
     # Clear Python cache before starting
     clear_python_cache()
 
     print(f"\nStarting MixingCompass on port {port}...")
 
     try:
-        # Start uvicorn server
-        cmd = [
-            sys.executable, "-m", "uvicorn",
-            "app.main:app",
-            "--host", "0.0.0.0",
-            "--port", str(port),
-            "--reload"
-        ]
+        import uvicorn
 
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
+        # Serve from this interpreter instead of starting a second one for uvicorn;
+        # reload and workers are mutually exclusive in uvicorn
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=reload,
+            workers=None if reload else workers
+        )
+    except ImportError as e:
         print(f"Failed to start application: {e}")
         sys.exit(1)
     except KeyboardInterrupt:
@@ -305,23 +544,24 @@ def main():
     parser = argparse.ArgumentParser(description="Start MixingCompass application")
     parser.add_argument("--port", "-p", type=int, default=8200,
                        help="Port to run the application on (default: 8200)")
-    parser.add_argument("--force-kill", "-f", action="store_true", default=True,
-                       help="Force kill processes using the target port (default: True)")
-    parser.add_argument("--no-force", action="store_true",
-                       help="Disable force kill, ask user interactively")
+    parser.add_argument("--force-kill", "-f", action=argparse.BooleanOptionalAction, default=True,
+                       help="Force kill processes using the target port; --no-force-kill asks interactively (default: True)")
+    # Older spelling of --no-force-kill
+    parser.add_argument("--no-force", dest="force_kill", action="store_false",
+                       help=argparse.SUPPRESS)
     parser.add_argument("--allow-alternative", "-a", action="store_true",
                        help="Allow using alternative ports if target port cannot be cleared")
     parser.add_argument("--clear-port-only", "-c", action="store_true",
                        help="Only clear the port, don't start the application")
+    parser.add_argument("--ephemeral", "-e", action="store_true",
+                       help="Run on any free port chosen by the system, skipping port preparation")
+    parser.add_argument("--reload", "-r", action="store_true",
+                       help="Restart the server when source files change (development)")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                       help="Number of uvicorn worker processes, ignored with --reload (default: 1)")
 
     args = parser.parse_args()
 
-    # Handle conflicting options
-    if args.no_force:
-        force_kill = False
-    else:
-        force_kill = args.force_kill
-
     port_manager = PortManager(args.port)
 
     try:
@@ -329,7 +569,7 @@ def main():
             # Just clear the port and exit
             print(f"Clearing port {args.port}...")
             if port_manager.is_port_in_use(args.port):
-                success = port_manager.kill_process_on_port(args.port, force=force_kill)
+                success = port_manager.kill_process_on_port(args.port, force=args.force_kill)
                 if success:
                     print(f"Port {args.port} cleared successfully.")
                 else:
@@ -339,15 +579,20 @@ def main():
                 print(f"Port {args.port} is already available.")
             return
 
-        # Prepare the port
-        available_port = port_manager.prepare_port(
-            port=args.port,
-            force_kill=force_kill,
-            allow_alternative=args.allow_alternative
-        )
+        if args.ephemeral:
+            # Any free port will do: ask the kernel instead of clearing one
+            available_port = port_manager.get_ephemeral_port()
+            print(f"Using system-assigned port: {available_port}")
+        else:
+            # Prepare the port
+            available_port = port_manager.prepare_port(
+                port=args.port,
+                force_kill=args.force_kill,
+                allow_alternative=args.allow_alternative
+            )
 
         # Start the application
-        start_application(available_port)
+        start_application(available_port, reload=args.reload, workers=args.workers)
 
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
@@ -5,6 +5,9 @@ Test API directly with detailed error handling
 import requests
 import json
 
+# Shared session so consecutive calls reuse the keep-alive connection
+SESSION = requests.Session()
+
 def test_api_experiment_creation():
     """Test experiment creation via API with detailed error reporting"""
 
@@ -30,10 +33,9 @@ def test_api_experiment_creation():
     print(f"Data: {json.dumps(experiment_data, indent=2)}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/experiments",
-            json=experiment_data,
-            headers={'Content-Type': 'application/json'}
+            json=experiment_data
         )
 
         print(f"Response status: {response.status_code}")
@@ -80,7 +82,7 @@ def test_minimal_experiment():
     print(f"Data: {json.dumps(minimal_data, indent=2)}")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/experiments",
             json=minimal_data
         )
@@ -0,0 +1,74 @@
+"""
+Regression test for the solvent CSV consolidation script on small fixture files
+"""
+
+import sys
+sys.path.append('scripts')
+
+import pandas as pd
+import pytest
+
+from consolidate_solvent_csv import CSVConsolidator, OUTPUT_COLUMNS
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    """Two source files sharing one solvent, with placeholders and an unnamed row"""
+    source = tmp_path / "solvents"
+    source.mkdir()
+    (source / "HSP_Calculations.csv").write_text(
+        "Solvents,dD,dP,dH,Tv,Cas,Unused\n"
+        "Acetone,15.5,10.4,7.0,56,67-64-1,x\n"
+        "Toluene™,18.0,1.4,2.0,-,108-88-3,x\n"
+        ",1.0,1.0,1.0,,,x\n",
+        encoding="utf-8-sig"
+    )
+    (source / "Other.csv").write_text(
+        "Solvent,delta_D,delta_P,delta_H,WGK,Molecular Formula\n"
+        "acetone (dimethyl ketone),15.5,10.4,7.0,1,C3H6O\n"
+        "Chloroform,17.8,3.1,-,3 1,CHCl3\n",
+        encoding="utf-8-sig"
+    )
+    (source / "list.csv").write_text(
+        "file,URL\n"
+        "HSP_Calculations.csv,https://example.org/hsp\n",
+        encoding="utf-8-sig"
+    )
+    return source
+
+
+def test_consolidation_output(input_dir, tmp_path):
+    output_file = tmp_path / "solvents.csv"
+    consolidator = CSVConsolidator(input_dir, output_file)
+    consolidator.run(url_file=input_dir / "list.csv")
+
+    df = pd.read_csv(output_file, encoding="utf-8-sig")
+
+    # Schema columns present in the sources are written in schema order, without
+    # unused source columns or the internal priority score
+    assert list(df.columns) == [
+        'Solvent', 'delta_D', 'delta_P', 'delta_H', 'Tb', 'WGK', 'CAS', 'CHO',
+        'source_file', 'source_row', 'completeness', 'source_url',
+    ]
+    assert set(df.columns) < set(OUTPUT_COLUMNS)
+
+    # The duplicate acetone keeps the richer row, the unnamed row is dropped,
+    # and rows are ordered by priority
+    assert df['Solvent'].tolist() == ["Acetone", "Toluene", "Chloroform"]
+    assert df['source_file'].tolist() == ["HSP_Calculations", "HSP_Calculations", "Other"]
+    assert df['source_row'].tolist() == [2, 3, 3]
+    assert consolidator.duplicate_stats == {"acetone": {"count": 1}}
+
+    rows = df.set_index('Solvent')
+    assert rows.loc["Acetone", 'Tb'] == 56
+    assert rows.loc["Acetone", 'CAS'] == "67-64-1"
+    assert rows.loc["Acetone", 'source_url'] == "https://example.org/hsp"
+    assert pd.isna(rows.loc["Toluene", 'Tb'])
+    assert rows.loc["Chloroform", 'WGK'] == 3
+    assert not rows.loc["Chloroform", 'CHO']
+    assert pd.isna(rows.loc["Chloroform", 'source_url'])
+
+    # Completeness is computed on the raw values: the '-' placeholder for
+    # Chloroform's delta_H counts as present, but is written as missing
+    assert (df['completeness'] == 1.0).all()
+    assert pd.isna(rows.loc["Chloroform", 'delta_H'])
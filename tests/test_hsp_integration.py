@@ -5,6 +5,9 @@ Test HSP calculation integration
 import requests
 import json
 
+# Shared session so consecutive calls reuse the keep-alive connection
+SESSION = requests.Session()
+
 def test_hsp_calculation():
     """Test the complete HSP calculation workflow"""
     base_url = "http://localhost:8200/api/hsp-experimental"
@@ -49,7 +52,7 @@ def test_hsp_calculation():
     try:
         # Step 1: Create experiment
         print("Step 1: Creating experiment...")
-        response = requests.post(f"{base_url}/experiments", json=test_experiment)
+        response = SESSION.post(f"{base_url}/experiments", json=test_experiment)
 
         if response.status_code == 200:
             result = response.json()
@@ -62,18 +65,21 @@ def test_hsp_calculation():
 
         # Step 2: Calculate HSP
         print("Step 2: Calculating HSP values...")
-        calc_response = requests.post(f"{base_url}/experiments/{experiment_id}/calculate")
+        calc_response = SESSION.post(f"{base_url}/experiments/{experiment_id}/calculate")
 
         if calc_response.status_code == 200:
             hsp_result = calc_response.json()
-            print("[OK] HSP calculation successful!")
-            print(f"   dD = {hsp_result['delta_d']:.1f} MPa^0.5")
-            print(f"   dP = {hsp_result['delta_p']:.1f} MPa^0.5")
-            print(f"   dH = {hsp_result['delta_h']:.1f} MPa^0.5")
-            print(f"   Ra = {hsp_result['radius']:.1f} MPa^0.5")
-            print(f"   Accuracy: {hsp_result['accuracy']:.3f}")
-            print(f"   Method: {hsp_result['method']}")
-            print(f"   Good solvents: {hsp_result['good_solvents']}/{hsp_result['solvent_count']}")
+            # Write the whole summary at once instead of one console write per line
+            print("\n".join([
+                "[OK] HSP calculation successful!",
+                f"   dD = {hsp_result['delta_d']:.1f} MPa^0.5",
+                f"   dP = {hsp_result['delta_p']:.1f} MPa^0.5",
+                f"   dH = {hsp_result['delta_h']:.1f} MPa^0.5",
+                f"   Ra = {hsp_result['radius']:.1f} MPa^0.5",
+                f"   Accuracy: {hsp_result['accuracy']:.3f}",
+                f"   Method: {hsp_result['method']}",
+                f"   Good solvents: {hsp_result['good_solvents']}/{hsp_result['solvent_count']}"
+            ]))
         else:
             print(f"[FAIL] HSP calculation failed: {calc_response.status_code}")
             print(calc_response.text)
@@ -81,7 +87,7 @@ def test_hsp_calculation():
 
         # Step 3: Verify experiment was updated
         print("Step 3: Verifying experiment update...")
-        get_response = requests.get(f"{base_url}/experiments/{experiment_id}")
+        get_response = SESSION.get(f"{base_url}/experiments/{experiment_id}")
 
         if get_response.status_code == 200:
             experiment = get_response.json()
@@ -115,7 +121,7 @@ def test_api_endpoints():
 
     try:
         # Test solvent list
-        response = requests.get(f"{base_url}/solvents")
+        response = SESSION.get(f"{base_url}/solvents")
         if response.status_code == 200:
             solvents = response.json()
             print(f"[OK] Solvents API: {len(solvents)} solvents available")
@@ -125,7 +131,7 @@ def test_api_endpoints():
         # Test specific solvent lookup (try common solvents)
         test_solvents = ["water", "ethanol", "acetone"]
         for solvent in test_solvents:
-            response = requests.get(f"{base_url}/solvents/{solvent}")
+            response = SESSION.get(f"{base_url}/solvents/{solvent}")
             if response.status_code == 200:
                 solvent_data = response.json()
                 print(f"[OK] Solvent lookup: {solvent} dD={solvent_data['delta_d']}")
@@ -134,7 +140,7 @@ def test_api_endpoints():
             print(f"[FAIL] All solvent lookups failed")
 
         # Test stats
-        response = requests.get(f"{base_url}/data/stats")
+        response = SESSION.get(f"{base_url}/data/stats")
         if response.status_code == 200:
             stats = response.json()
             solvent_info = stats.get('solvent_database', {})
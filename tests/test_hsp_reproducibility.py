@@ -0,0 +1,51 @@
+"""
+Test that recalculating an experiment through the API gives identical results
+"""
+
+import asyncio
+import sys
+sys.path.append('.')
+
+import pytest
+
+from app.api import hsp_experimental
+from app.models.hsp_models import HSPExperimentData
+from app.models.solvent_models import SolventTest, SolubilityType
+from app.services.data_manager import DataManager
+from app.services.hsp_calculator import hsp_calculator
+
+GOOD_SOLVENTS = ["acetone", "toluene", "chloroform", "tetrahydrofuran", "dichloromethane", "ethyl acetate"]
+BAD_SOLVENTS = ["hexane", "water", "methanol", "ethanol", "cyclohexane", "ethylene glycol", "heptane"]
+
+
+@pytest.fixture
+def experiment_id(tmp_path, monkeypatch):
+    """Save an experiment in a temporary data directory used by the API"""
+    manager = DataManager(str(tmp_path))
+    monkeypatch.setattr(hsp_experimental, "data_manager", manager)
+
+    solvent_tests = (
+        [SolventTest(solvent_name=name, solubility=SolubilityType.SOLUBLE) for name in GOOD_SOLVENTS]
+        + [SolventTest(solvent_name=name, solubility=SolubilityType.INSOLUBLE) for name in BAD_SOLVENTS]
+    )
+    experiment = HSPExperimentData(sample_name="Reproducibility Test", solvent_tests=solvent_tests)
+    return manager.save_experiment(experiment)
+
+
+@pytest.mark.parametrize("loss_function", ["cross_entropy", "log_barrier"])
+def test_recalculation_is_reproducible(experiment_id, loss_function):
+    """Recalculating the same data twice must not depend on the stored result"""
+    results = []
+    for _ in range(2):
+        # Refit every time instead of answering from the result cache
+        hsp_calculator.clear_cache()
+        result = asyncio.run(
+            hsp_experimental.calculate_hsp(experiment_id, {"loss_function": loss_function})
+        )
+        results.append(result)
+
+    first, second = results
+    assert hsp_experimental.data_manager.load_experiment(experiment_id).calculated_hsp is not None
+    assert (first.delta_d, first.delta_p, first.delta_h, first.radius) == \
+        (second.delta_d, second.delta_p, second.delta_h, second.radius)
+    assert first.data_fit == second.data_fit
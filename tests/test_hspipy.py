@@ -2,10 +2,20 @@
 Test HSPiPy library functionality
 """
 
+import os
+import tempfile
 import pandas as pd
 import numpy as np
 from hspipy import HSP
 
+def _scratch_dir():
+    """Temporary directory for the HSPiPy input CSVs (RAM-backed /dev/shm when available)
+
+    HSP.read only accepts file paths, so the data cannot be passed as a StringIO.
+    """
+    shm_dir = '/dev/shm'
+    return tempfile.TemporaryDirectory(dir=shm_dir if os.path.isdir(shm_dir) else None)
+
 def test_hspipy_basic():
     """Test basic HSPiPy functionality"""
     print("Testing HSPiPy basic functionality...")
@@ -22,30 +32,33 @@ def test_hspipy_basic():
     print("Sample data:")
     print(sample_data)
 
-    # Save to CSV for HSPiPy
-    sample_data.to_csv('test_solvents.csv', index=False)
+    with _scratch_dir() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'test_solvents.csv')
+
+        # Save to CSV for HSPiPy
+        sample_data.to_csv(csv_path, index=False)
 
-    # Test HSPiPy
-    try:
-        hsp = HSP()
+        # Test HSPiPy
+        try:
+            hsp = HSP()
 
-        # Check available methods
-        print("\nHSP object methods:")
-        print([method for method in dir(hsp) if not method.startswith('_')])
+            # Check available methods
+            print("\nHSP object methods:")
+            print([method for method in dir(hsp) if not method.startswith('_')])
 
-        # Try to read data
-        print("\nReading data...")
-        hsp.read('test_solvents.csv')
+            # Try to read data
+            print("\nReading data...")
+            hsp.read(csv_path)
 
-        print("Data loaded successfully!")
-        print(f"Columns: {hsp.data.columns.tolist()}")
-        print(f"Shape: {hsp.data.shape}")
+            print("Data loaded successfully!")
+            print(f"Columns: {hsp.data.columns.tolist()}")
+            print(f"Shape: {hsp.data.shape}")
 
-        return True
+            return True
 
-    except Exception as e:
-        print(f"Error testing HSPiPy: {e}")
-        return False
+        except Exception as e:
+            print(f"Error testing HSPiPy: {e}")
+            return False
 
 def test_hsp_calculation():
     """Test HSP calculation with proper data format"""
@@ -62,26 +75,28 @@ def test_hsp_calculation():
         'Data': [1, 1, 1, 0, 0]  # Solubility data
     })
 
-    sample_data.to_csv('test_hsp_format.csv', index=False)
+    with _scratch_dir() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'test_hsp_format.csv')
+        sample_data.to_csv(csv_path, index=False)
 
-    try:
-        hsp = HSP()
-        hsp.read('test_hsp_format.csv')
+        try:
+            hsp = HSP()
+            hsp.read(csv_path)
 
-        print("Attempting HSP calculation...")
-        hsp.get(inside_limit=1)
+            print("Attempting HSP calculation...")
+            hsp.get(inside_limit=1)
 
-        print(f"Calculated HSP: δD={hsp.d:.1f}, δP={hsp.p:.1f}, δH={hsp.h:.1f}")
-        print(f"Sphere radius: {hsp.radius:.1f}")
-        print(f"Accuracy: {hsp.accuracy:.3f}")
+            print(f"Calculated HSP: δD={hsp.d:.1f}, δP={hsp.p:.1f}, δH={hsp.h:.1f}")
+            print(f"Sphere radius: {hsp.radius:.1f}")
+            print(f"Accuracy: {hsp.accuracy:.3f}")
 
-        return True
+            return True
 
-    except Exception as e:
-        print(f"Error in HSP calculation: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        except Exception as e:
+            print(f"Error in HSP calculation: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
 
 if __name__ == "__main__":
     print("HSPiPy Library Test")
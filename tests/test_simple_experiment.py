@@ -5,6 +5,9 @@ Test simple experiment creation
 import requests
 import json
 
+# Shared session so consecutive calls reuse the keep-alive connection
+SESSION = requests.Session()
+
 def test_simple_experiment():
     """Test creating experiment with minimal data"""
     base_url = "http://localhost:8200/api/hsp-experimental"
@@ -24,7 +27,7 @@ def test_simple_experiment():
     print(json.dumps(simple_experiment, indent=2))
 
     try:
-        response = requests.post(f"{base_url}/experiments", json=simple_experiment)
+        response = SESSION.post(f"{base_url}/experiments", json=simple_experiment)
 
         print(f"\nResponse status: {response.status_code}")
 
@@ -34,7 +37,7 @@ def test_simple_experiment():
             print(f"Experiment ID: {result['id']}")
 
             # Get the created experiment
-            get_response = requests.get(f"{base_url}/experiments/{result['id']}")
+            get_response = SESSION.get(f"{base_url}/experiments/{result['id']}")
             if get_response.status_code == 200:
                 exp_data = get_response.json()
                 print("\nCreated experiment data:")
@@ -0,0 +1,97 @@
+"""
+Test the theory-based loss functions against plain NumPy reference implementations
+"""
+
+import sys
+sys.path.append('.')
+
+import numpy as np
+import pytest
+
+from app.services import theory_based_loss
+from app.services.theory_based_loss import LOSS_FUNCTIONS, get_loss_function
+
+
+def _reference_loss(name, HSP, X, y, epsilon=1e-6):
+    """Mean per-sample loss of one candidate, written directly from the formulas"""
+    D, P, H, R = HSP
+    red = np.sqrt(np.sum((X - np.array([D, P, H])) ** 2, axis=1)) / R
+    good, poor = y == 1.0, y == 0.0
+    partial = np.abs(red - 1)
+
+    if name == 'boundary_distance':
+        loss = np.where(good, np.maximum(0, red - 1), np.where(poor, np.maximum(0, 1 - red), partial))
+    elif name == 'proportional_boundary':
+        loss = y * np.maximum(0, red - 1) + (1 - y) * np.maximum(0, 1 - red)
+    elif name == 'log_barrier':
+        with np.errstate(invalid='ignore'):
+            good_loss = np.where(red < 1 - epsilon, -np.log(1 - red + epsilon), 10.0 * (red - 1 + epsilon))
+            poor_loss = np.where(red > 1 + epsilon, -np.log(red - 1 + epsilon), 10.0 * (1 + epsilon - red))
+        loss = np.where(good, good_loss, np.where(poor, poor_loss, partial))
+    elif name == 'normalized_distance':
+        loss = np.where(good, red, np.where(poor, 1.0 / (red + 1e-6), partial))
+    elif name == 'cross_entropy':
+        p_soluble = np.clip(1.0 / (1.0 + red ** 2), 1e-7, 1 - 1e-7)
+        loss = -(y * np.log(p_soluble) + (1 - y) * np.log(1 - p_soluble))
+    else:
+        raise ValueError(name)
+
+    return np.mean(loss)
+
+
+def _make_data(with_partial, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform([14.0, 0.0, 0.0], [22.0, 20.0, 25.0], size=(60, 3))
+    labels = [0.0, 0.5, 1.0] if with_partial else [0.0, 1.0]
+    y = rng.choice(labels, size=len(X))
+    population = rng.uniform([14.0, 0.0, 0.0, 3.0], [22.0, 20.0, 25.0, 15.0], size=(40, 4)).T
+    return X, y, population
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def numba_mode(request, monkeypatch):
+    """Run each test with the Numba kernels and with the NumPy fallback"""
+    if request.param and not theory_based_loss.NUMBA_AVAILABLE:
+        pytest.skip("Numba is not installed")
+    monkeypatch.setattr(theory_based_loss, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("with_partial", [False, True], ids=["binary", "partial"])
+@pytest.mark.parametrize("name", list(LOSS_FUNCTIONS))
+def test_loss_matches_reference(numba_mode, name, with_partial):
+    X, y, population = _make_data(with_partial)
+    expected = np.array([_reference_loss(name, population[:, m], X, y) for m in range(population.shape[1])])
+
+    loss_func = get_loss_function(name)
+    batch = loss_func(population, X, y)
+    scalar = np.array([loss_func(population[:, m], X, y) for m in range(population.shape[1])])
+
+    # The loss data is stored as float32, so compare at float32 precision
+    np.testing.assert_allclose(batch, expected, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(scalar, expected, rtol=1e-4, atol=1e-5)
+
+
+@pytest.mark.parametrize("name", list(LOSS_FUNCTIONS))
+def test_size_factor_adds_radius_penalty(numba_mode, name):
+    X, y, population = _make_data(with_partial=False)
+    HSP = population[:, 0]
+
+    base_loss, radius_penalty = get_loss_function(name).decompose(HSP, X, y)
+    total = get_loss_function(name, size_factor=0.01)(HSP, X, y)
+
+    assert radius_penalty == HSP[3] ** 2
+    assert total == pytest.approx(base_loss + 0.01 * radius_penalty)
+
+
+def test_numpy_batch_is_chunked_consistently(monkeypatch):
+    """Large populations split into chunks give the same losses as one pass"""
+    monkeypatch.setattr(theory_based_loss, "NUMBA_AVAILABLE", False)
+    X, y, population = _make_data(with_partial=True)
+
+    expected = get_loss_function('cross_entropy')(population, X, y)
+    # Three candidates per chunk for the 60 samples
+    monkeypatch.setattr(theory_based_loss, "BATCH_CHUNK_ELEMENTS", 180)
+    chunked = get_loss_function('cross_entropy')(population, X, y)
+
+    np.testing.assert_allclose(chunked, expected, rtol=1e-6)